@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+
+from playwright.async_api import Browser, BrowserContext
+
+from broker_agent.browser.utils import (
+    get_browser_context_config,
+    pick_user_agent,
+    route_handler,
+)
+from broker_agent.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _ContextStats:
+    user_agent: str
+    in_use: bool = False
+    last_used: float = 0.0
+    usage_count: int = 0
+
+
+class ContextPool:
+    """
+    Bounded pool of reusable BrowserContexts on a single shared browser.
+
+    At most ``max_size`` contexts exist at once; callers beyond that wait in
+    ``acquire``. A caller that passes a user agent only reuses an idle context
+    created with that agent, so a new agent also gets a new fingerprint; the
+    least recently returned idle context is closed to make room for it. A context
+    is destroyed and replaced once it has been used ``max_uses`` times or if the
+    work done with it raised. Idle contexts older than ``max_idle_time`` seconds
+    are closed by the background task started with ``start_cleanup``.
+
+    Callers that hold a context while acquiring another one (e.g. a search page
+    that spawns listing pages) need ``max_size`` to exceed the number of such
+    callers, otherwise they can wait on each other forever.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        max_size: int,
+        max_uses: int = 20,
+        max_idle_time: float = 300.0,
+    ):
+        self._browser = browser
+        self._max_size = max_size
+        self._max_uses = max_uses
+        self._max_idle_time = max_idle_time
+        self._semaphore = asyncio.Semaphore(max_size)
+        self._idle: list[BrowserContext] = []
+        self._stats: dict[BrowserContext, _ContextStats] = {}
+        self._cleanup_task: asyncio.Task[None] | None = None
+
+    @asynccontextmanager
+    async def acquire(
+        self, user_agent: str | None = None
+    ) -> AsyncIterator[BrowserContext]:
+        """
+        Borrow a context from the pool, creating one if none are idle.
+
+        Args:
+            user_agent: Only reuse a context created with this user agent. Any
+                idle context is reused when omitted.
+        """
+        async with self._semaphore:
+            context = self._take_idle(user_agent)
+            if context is None:
+                if self._idle and len(self._stats) >= self._max_size:
+                    await self._destroy_context(self._idle[0])
+                context = await self._create_context(user_agent or pick_user_agent())
+            stats = self._stats[context]
+            stats.in_use = True
+            stats.usage_count += 1
+            try:
+                yield context
+            except BaseException:
+                await self._destroy_context(context)
+                raise
+            stats.in_use = False
+            stats.last_used = time.monotonic()
+            if stats.usage_count >= self._max_uses:
+                await self._destroy_context(context)
+            else:
+                self._idle.append(context)
+
+    def start_cleanup(self, interval: float = 60.0) -> None:
+        """Start a background task that periodically closes stale idle contexts."""
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop(interval))
+
+    async def close(self) -> None:
+        """Stop the cleanup task and close every context owned by the pool."""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._cleanup_task
+            self._cleanup_task = None
+        for context in list(self._stats):
+            await self._destroy_context(context)
+
+    def _take_idle(self, user_agent: str | None) -> BrowserContext | None:
+        for i in range(len(self._idle) - 1, -1, -1):
+            context = self._idle[i]
+            if user_agent is None or self._stats[context].user_agent == user_agent:
+                return self._idle.pop(i)
+        return None
+
+    async def _create_context(self, user_agent: str) -> BrowserContext:
+        context = await self._browser.new_context(
+            **get_browser_context_config(user_agent)
+        )
+        await context.route("**/*", route_handler)
+        self._stats[context] = _ContextStats(user_agent=user_agent)
+        logger.debug(f"Created pooled browser context ({len(self._stats)} open)")
+        return context
+
+    async def _destroy_context(self, context: BrowserContext) -> None:
+        self._stats.pop(context, None)
+        if context in self._idle:
+            self._idle.remove(context)
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled browser context: {e}")
+
+    async def _cleanup_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            cutoff = time.monotonic() - self._max_idle_time
+            stale = [
+                context
+                for context in self._idle
+                if self._stats[context].last_used < cutoff
+            ]
+            for context in stale:
+                await self._destroy_context(context)
+            if stale:
+                logger.debug(f"Closed {len(stale)} idle pooled browser contexts")
@@ -1,5 +1,4 @@
-import random
-import re
+from contextlib import AbstractAsyncContextManager
 
 from playwright.async_api import (
     Browser,
@@ -9,18 +8,87 @@ from playwright.async_api import (
 )
 from pydantic import BaseModel, PrivateAttr
 
+from broker_agent.browser.context_pool import ContextPool
+from broker_agent.browser.utils import get_browser_context_config, route_handler
 from broker_agent.config.logging import get_logger
-from broker_agent.config.settings import config
+from broker_agent.config.settings import get_config
 
 logger = get_logger(__name__)
 
+# Chromium adds --enable-automation by default, which exposes navigator.webdriver
+_IGNORE_DEFAULT_ARGS: tuple[str, ...] = ("--enable-automation",)
+
+
+def get_proxy_settings() -> dict:
+    """
+    Helper to return proxy settings.
+    TODO: Move these proxy details to your application's configuration (e.g., config.proxy_settings)
+    """
+    config = get_config()
+    if not config.BRD_PROXY_USERNAME or not config.BRD_PROXY_PASSWORD:
+        raise ValueError("Proxy username or password is not set in the configuration.")
+
+    return {
+        "server": config.BRD_SERVER,
+        "username": config.BRD_PROXY_USERNAME,
+        "password": config.BRD_PROXY_PASSWORD,
+    }
+
+
+def get_launch_options() -> dict:
+    """Helper to build the options used to launch a local Chromium instance."""
+    config = get_config()
+    launch_options = {
+        "headless": config.HEADLESS_BROWSER,
+        "args": config.browser_settings.chrome_args,
+        "ignore_default_args": list(_IGNORE_DEFAULT_ARGS),
+    }
+    proxy_settings = get_proxy_settings()
+    if proxy_settings:
+        launch_options["proxy"] = proxy_settings
+    return launch_options
+
+
+async def launch_shared_browser(playwright: Playwright) -> Browser:
+    """
+    Launch a single local Chromium instance to back a ContextPool.
+
+    Scrapers borrow isolated BrowserContexts on it through the pool, so the
+    Chromium process start-up cost is paid once per run. The caller owns the
+    browser and is responsible for closing it.
+    """
+    logger.info("Launching shared local Chromium instance")
+    return await playwright.chromium.launch(**get_launch_options())
+
+
+async def connect_shared_browser(playwright: Playwright, endpoint: str) -> Browser:
+    """
+    Connect to an already running Chromium over CDP to back a ContextPool.
+
+    Used with the ``start_browser`` command so repeated runs skip Chromium start-up.
+    Closing the returned browser only disconnects from it and discards the
+    contexts this run created; the Chromium process keeps running.
+    """
+    logger.info(f"Connecting to persistent Chromium at {endpoint}")
+    return await playwright.chromium.connect_over_cdp(endpoint)
+
 
 class ScrapingBrowser(BaseModel):
-    """Manages a Playwright browser instance for scraping."""
+    """
+    Manages a Playwright browser context for scraping.
+
+    When a ``pool`` is supplied, a context is borrowed from it and a fresh page is
+    opened on it; on exit the page is closed and the context handed back. Otherwise
+    a browser is launched (or connected to over CDP) for the lifetime of this object.
+    """
 
     _playwright: Playwright = PrivateAttr()
     _user_agent: str = PrivateAttr()
     _browser: Browser | None = PrivateAttr(default=None)
+    _pool: ContextPool | None = PrivateAttr(default=None)
+    _lease: AbstractAsyncContextManager[BrowserContext] | None = PrivateAttr(
+        default=None
+    )
     _context: BrowserContext | None = PrivateAttr(default=None)
     _page: Page | None = PrivateAttr(default=None)
     scrape_images: bool = True
@@ -30,12 +98,15 @@ class ScrapingBrowser(BaseModel):
         playwright: Playwright,
         user_agent: str,
         scrape_images: bool = True,
+        pool: ContextPool | None = None,
         **data,
     ):
         super().__init__(scrape_images=scrape_images, **data)
         self._playwright = playwright
         self._user_agent = user_agent
         self._browser = None
+        self._pool = pool
+        self._lease = None
         self._context = None
         self._page = None
 
@@ -44,17 +115,23 @@ class ScrapingBrowser(BaseModel):
         Initializes the browser, context, and page using the browser via BROWSER_API_ENDPOINT.
         """
         try:
+            if self._pool is not None:
+                # Pooled contexts carry their own routes; only one created with
+                # this user agent is reused, so each agent keeps its fingerprint
+                lease = self._pool.acquire(self._user_agent)
+                self._context = await lease.__aenter__()
+                self._lease = lease
+                self._page = await self._context.new_page()
+                return self._page
+
+            config = get_config()
             if config.LOCAL_BROWSER:
-                proxy_settings = self._get_proxy_settings()
-                launch_options = {
-                    "headless": config.HEADLESS_BROWSER,
-                }
-                if proxy_settings:
-                    launch_options["proxy"] = proxy_settings
-
-                self._browser = await self._playwright.chromium.launch(**launch_options)
-                context_config = await self._get_browser_context_config()
-                self._context = await self._browser.new_context(**context_config)
+                self._browser = await self._playwright.chromium.launch(
+                    **get_launch_options()
+                )
+                self._context = await self._browser.new_context(
+                    **get_browser_context_config(self._user_agent)
+                )
             else:
                 self._browser = await self._playwright.chromium.connect_over_cdp(
                     config.BROWSER_API_ENDPOINT
@@ -65,11 +142,13 @@ class ScrapingBrowser(BaseModel):
                 self._context = await self._browser.new_context()
 
             # Route to control resource loading and blocked URLs
-            await self._context.route("**/*", self._route_handler)
+            await self._context.route("**/*", route_handler)
             self._page = await self._context.new_page()
             return self._page
         except Exception as e:
-            if self._context:
+            if self._lease is not None:
+                await self._lease.__aexit__(type(e), e, e.__traceback__)
+            elif self._context:
                 try:
                     await self._context.close()
                 except Exception:
@@ -79,8 +158,15 @@ class ScrapingBrowser(BaseModel):
             raise RuntimeError(f"Could not start browser context. Error: {e}") from e
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Closes the browser."""
-        if self._browser:
+        """Closes the browser, or returns the context to the pool."""
+        if self._lease is not None:
+            if self._page:
+                try:
+                    await self._page.close()
+                except Exception:
+                    pass
+            await self._lease.__aexit__(exc_type, exc_val, exc_tb)
+        elif self._browser:
             await self._browser.close()
 
     @property
@@ -94,58 +180,3 @@ class ScrapingBrowser(BaseModel):
     @property
     def browser(self) -> Browser | None:
         return self._browser
-
-    async def _route_handler(self, route):
-        """
-        Helper function to handle routing for blocking URLs and controlling resource loading.
-        Blocks images, CSS, fonts, and media.
-        """
-        request_url = route.request.url
-        resource_type = route.request.resource_type
-
-        # Block URLs based on patterns
-        for pattern in config.browser_settings.blocked_url_patterns:
-            if re.match(pattern, request_url):
-                await route.abort()
-                return
-
-        # Block images, CSS, fonts, and media
-        # block_types = {"image", "stylesheet", "font", "media"}
-        block_types = {"image"}
-        if resource_type in block_types:
-            await route.abort()
-            return
-
-        await route.continue_()
-
-    async def _get_browser_context_config(self) -> dict:
-        """Helper to generate browser context configuration."""
-        viewport = random.choice(config.browser_settings.viewport_sizes)
-        timezone_id = random.choice(config.browser_settings.timezones)
-        return {
-            "user_agent": self._user_agent,
-            "viewport": viewport,
-            "locale": "en-US",
-            "timezone_id": timezone_id,
-            "device_scale_factor": random.choice([1, 2]),
-            "has_touch": random.choice([True, False]),
-            "permissions": ["geolocation"],
-            "java_script_enabled": True,
-            "bypass_csp": True,
-        }
-
-    def _get_proxy_settings(self) -> dict:
-        """
-        Helper to return proxy settings.
-        TODO: Move these proxy details to your application's configuration (e.g., config.proxy_settings)
-        """
-        if not config.BRD_PROXY_USERNAME or not config.BRD_PROXY_PASSWORD:
-            raise ValueError(
-                "Proxy username or password is not set in the configuration."
-            )
-
-        return {
-            "server": config.BRD_SERVER,
-            "username": config.BRD_PROXY_USERNAME,
-            "password": config.BRD_PROXY_PASSWORD,
-        }
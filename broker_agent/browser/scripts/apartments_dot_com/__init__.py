@@ -3,9 +3,11 @@ from broker_agent.browser.scripts.apartments_dot_com.apartments_dot_com_listing
 )
 from broker_agent.browser.scripts.apartments_dot_com.apartments_dot_com_search import (
     get_apartments_dot_com_listings,
+    get_apartments_dot_com_page_listings,
 )
 
 __all__ = [
     "process_apartments_dot_com_listings",
     "get_apartments_dot_com_listings",
+    "get_apartments_dot_com_page_listings",
 ]
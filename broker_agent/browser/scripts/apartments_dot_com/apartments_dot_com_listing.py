@@ -3,6 +3,7 @@ from playwright.async_api import Page, Playwright
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from broker_agent.browser.context_pool import ContextPool
 from broker_agent.browser.scraping_browser import ScrapingBrowser
 from broker_agent.common.exceptions import (
     ApartmentScrapingError,
@@ -10,9 +11,9 @@ from broker_agent.common.exceptions import (
 )
 from broker_agent.common.utils import (
     get_text_content,
-    is_listing_duplicate,
     parse_availability_date,
     parse_price_as_float,
+    prefetch_existing_links,
     random_extra_click,
     random_human_delay,
 )
@@ -29,6 +30,7 @@ async def process_apartments_dot_com_listings(
     playwright: Playwright,
     user_agent: str,
     listings: list[str],
+    pool: ContextPool | None = None,
 ) -> int:
     """
     Helper to process each listing URL in detail and save to DB.
@@ -37,17 +39,18 @@ async def process_apartments_dot_com_listings(
     processed_count = 0
     try:
         async with async_db_session() as session:
+            existing_links = await prefetch_existing_links(session, listings)
             for i, listing_url in enumerate(listings):
                 logger.info(f"Processing listing {i+1}/{len(listings)}: {listing_url}")
                 # Check for duplicate before scraping
-                if await is_listing_duplicate(session, listing_url):
+                if listing_url in existing_links:
                     logger.warning(
                         f"Duplicate listing found for link '{listing_url}'. Skipping insertion."
                     )
                     continue
                 try:
                     async with ScrapingBrowser(
-                        playwright, user_agent, scrape_images=False
+                        playwright, user_agent, scrape_images=False, pool=pool
                     ) as listing_detail_page:
                         try:
                             await _process_apartments_dot_com_listing(
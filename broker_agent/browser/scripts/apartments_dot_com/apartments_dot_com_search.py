@@ -1,10 +1,72 @@
-from playwright.async_api import Page
+from playwright.async_api import Page, Playwright
 
-from broker_agent.common.utils import random_human_delay
+from broker_agent.browser.context_pool import ContextPool
+from broker_agent.browser.scraping_browser import ScrapingBrowser
+from broker_agent.browser.scripts.apartments_dot_com.utils import (
+    get_apartments_dot_com_page_url,
+)
+from broker_agent.common.circuit_breaker import CircuitBreaker
+from broker_agent.common.enum import WebsiteType
+from broker_agent.common.exceptions import CircuitOpenError, ScraperAccessDenied
+from broker_agent.common.utils import random_human_delay, run_with_retries
 from broker_agent.config.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Search page loads fail fast once Apartments.com has failed repeatedly
+_SEARCH_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=60.0)
+
+
+async def get_apartments_dot_com_page_listings(
+    playwright: Playwright,
+    user_agent: str,
+    page_number: int,
+    max_retries: int,
+    base_delay: float,
+    max_delay: float,
+    pool: ContextPool | None = None,
+) -> list[str]:
+    """
+    Opens a search results page directly by number in its own ScrapingBrowser and
+    returns its listing URLs, so several pages can be fetched at once.
+    Throws ScraperAccessDenied if the page is blocked, and CircuitOpenError without
+    navigating if recent page loads keep failing.
+    """
+    if not _SEARCH_BREAKER.allow(WebsiteType.APARTMENTS_DOT_COM):
+        raise CircuitOpenError("Too many failed Apartments.com search page loads.")
+
+    url = get_apartments_dot_com_page_url(page_number)
+    async with ScrapingBrowser(
+        playwright, user_agent, scrape_images=False, pool=pool
+    ) as page:
+
+        async def navigate() -> None:
+            logger.info(f"Navigating to page {page_number}: {url}")
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            title = await page.title()
+            if "denied" in title.lower() or "robot" in title.lower():
+                raise ScraperAccessDenied(
+                    "Access denied to Apartments.com for [Search]."
+                )
+
+        try:
+            await run_with_retries(
+                action=navigate,
+                max_retries=max_retries,
+                base_delay=base_delay,
+                max_delay=max_delay,
+                logger=logger,
+                action_name=f"load search page {page_number}",
+                fatal_exceptions=(ScraperAccessDenied,),
+            )
+        except Exception:
+            _SEARCH_BREAKER.record_failure(WebsiteType.APARTMENTS_DOT_COM)
+            raise
+        _SEARCH_BREAKER.record_success(WebsiteType.APARTMENTS_DOT_COM)
+
+        await random_human_delay()
+        return await get_apartments_dot_com_listings(page)
+
 
 async def get_apartments_dot_com_listings(
     page: Page,
@@ -1,32 +1,49 @@
+import asyncio
+import random
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+
 from playwright._impl._errors import TargetClosedError
 from playwright.async_api import Playwright
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from broker_agent.browser.context_pool import ContextPool
 from broker_agent.browser.scraping_browser import ScrapingBrowser
 from broker_agent.browser.scripts.streeteasy.streeteasy_listing import (
-    process_streeteasy_listing,
+    save_listings_to_db,
+    scrape_streeteasy_listing,
 )
 from broker_agent.browser.scripts.streeteasy.streeteasy_search import (
-    streeteasy_save_listings,
+    streeteasy_iter_listings,
     streeteasy_search,
 )
 from broker_agent.common.enum import ApartmentType, WebsiteType
 from broker_agent.common.exceptions import (
+    CircuitOpenError,
     PageNavigationLimitReached,
     ScraperAccessDenied,
 )
+from broker_agent.common.utils import prefetch_existing_links
 from broker_agent.config.logging import get_logger
-from broker_agent.config.settings import config
+from broker_agent.config.settings import get_config
 from database.connection import async_db_session
 
 logger = get_logger(__name__)
 
+# Scraped listings waiting to be saved; scrapers block once it is full
+_QUEUE_SIZE = 500
+
 
-async def get_streeteasy_listings(playwright: Playwright, user_agent: str) -> list[str]:
+async def get_streeteasy_listings(
+    playwright: Playwright, user_agent: str, pool: ContextPool | None = None
+) -> AsyncIterator[list[str]]:
     """
-    Helper to perform the search and return listing URLs from StreetEasy.
+    Helper to perform the search and yield listing URLs from StreetEasy, one
+    results page at a time. The search browser stays open until the generator
+    is exhausted or closed.
     """
     async with ScrapingBrowser(
-        playwright, user_agent, scrape_images=False
+        playwright, user_agent, scrape_images=False, pool=pool
     ) as search_page:
         await search_page.goto(WebsiteType.STREETEASY.value, timeout=60000)
 
@@ -34,6 +51,7 @@ async def get_streeteasy_listings(playwright: Playwright, user_agent: str) -> li
         if "denied" in title.lower():
             raise ScraperAccessDenied("Access denied to StreetEasy for [Search].")
 
+        config = get_config()
         await streeteasy_search(
             search_page,
             min_price=config.streeteasy_min_price,
@@ -41,45 +59,206 @@ async def get_streeteasy_listings(playwright: Playwright, user_agent: str) -> li
             apt_type=ApartmentType(config.streeteasy_apt_type),
         )
 
-        listings = await streeteasy_save_listings(search_page)
-
-        logger.info(f"Found {len(listings)} listings to process using [Search].")
-        logger.debug(f"Listings from [Search]: {listings}")
+        found = 0
+        async for listings in streeteasy_iter_listings(search_page):
+            found += len(listings)
+            logger.debug(f"Listings from [Search]: {listings}")
+            yield listings
 
-    return listings
+        logger.info(f"Found {found} listings to process using [Search].")
 
 
 async def process_streeteasy_listings(
     playwright: Playwright,
     user_agent: str,
-    listings: list[str],
+    listing_pages: AsyncIterator[list[str]],
+    pool: ContextPool | None = None,
 ) -> int:
     """
     Helper to process each listing URL in detail and save to DB.
     Returns the number of processed listings.
+
+    A producer feeds listings into a queue as each search results page arrives,
+    so detail scraping starts while the search is still paginating. Listings
+    already in the database are dropped page by page before they are queued.
+    ``browser_settings.listing_concurrency`` workers consume the queue, each
+    scraping its listing in its own ScrapingBrowser so the single-navigation
+    limit still holds.
+    Scraped listings are handed over a second queue to a single writer, which
+    saves and commits them in batches while scraping continues. A listing that
+    fails to scrape is logged and skipped.
+    """
+    run = _ListingRun(playwright, user_agent, pool)
+    async with async_db_session() as session:
+        writer = asyncio.create_task(_save_queued_listings(run.scraped, session))
+        tasks = [asyncio.create_task(run.produce(listing_pages))]
+        tasks += [asyncio.create_task(run.work()) for _ in range(run.workers)]
+        try:
+            await _gather_watching_writer(tasks, writer)
+        except BaseException as e:
+            # Stop the search and remaining listings before the session is closed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not isinstance(e, PageNavigationLimitReached):
+                # Save what was already scraped unless the run itself is cancelled
+                await _stop_writer(writer, run.scraped, drain=isinstance(e, Exception))
+                raise
+            logger.warning(
+                f"ScrapingBrowser encountered overall navigation limit. "
+                f"Processed {run.processed_count} listings before stop."
+            )
+        # Listings scraped before a navigation limit stop are still saved
+        await _stop_writer(writer, run.scraped, drain=True)
+    return run.processed_count
+
+
+class _ListingRun:
+    """
+    The producer and listing workers of one ``process_streeteasy_listings`` run,
+    and the queues between them and the writer.
     """
-    processed_count = 0
-    try:
-        async with async_db_session() as session:
-            for i, listing_url in enumerate(listings):
-                logger.info(f"Processing listing {i+1}/{len(listings)}: {listing_url}")
-                try:
-                    async with ScrapingBrowser(
-                        playwright, user_agent, scrape_images=False
-                    ) as listing_detail_page:
-                        await process_streeteasy_listing(
-                            listing_detail_page, listing_url, session
-                        )
-                        processed_count += 1
-                except TargetClosedError as e:
-                    logger.error(
-                        f"Target closed while processing {listing_url}: {e}. "
-                        f"Skipping this listing. {processed_count} listings processed so far."
-                    )
-                    continue
-    except PageNavigationLimitReached:
-        logger.warning(
-            f"ScrapingBrowser encountered overall navigation limit. "
-            f"Processed {processed_count} listings before stop."
+
+    def __init__(
+        self, playwright: Playwright, user_agent: str, pool: ContextPool | None
+    ):
+        self.playwright = playwright
+        self.user_agent = user_agent
+        self.pool = pool
+        self.processed_count = 0
+        self.workers = get_config().browser_settings.listing_concurrency
+        self.pending: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue(
+            maxsize=self.workers
         )
-    return processed_count
+        self.scraped: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=_QUEUE_SIZE)
+
+    async def produce(self, listing_pages: AsyncIterator[list[str]]) -> None:
+        """Queue each page's unsaved listings, then one stop marker per worker."""
+        i = 0
+        # Lookups use their own session so they never wait on the writer
+        async with aclosing(listing_pages), async_db_session() as lookup_session:
+            async for listings in listing_pages:
+                existing_links = await prefetch_existing_links(lookup_session, listings)
+                random.shuffle(listings)
+                for listing_url in listings:
+                    if listing_url in existing_links:
+                        logger.info(f"Listing {listing_url} already saved. Skipping.")
+                        continue
+                    await self.pending.put((i, listing_url))
+                    i += 1
+        for _ in range(self.workers):
+            await self.pending.put(None)
+
+    async def work(self) -> None:
+        """Process queued listings until a stop marker arrives."""
+        while (item := await self.pending.get()) is not None:
+            await self.process_one(*item)
+
+    async def process_one(self, i: int, listing_url: str) -> None:
+        """Scrape one listing and queue it for the writer, skipping it on failure."""
+        logger.info(f"Processing listing {i + 1}: {listing_url}")
+        try:
+            async with ScrapingBrowser(
+                self.playwright, self.user_agent, scrape_images=False, pool=self.pool
+            ) as listing_detail_page:
+                listing_details = await scrape_streeteasy_listing(
+                    listing_detail_page, listing_url
+                )
+        except TargetClosedError as e:
+            logger.error(
+                f"Target closed while processing {listing_url}: {e}. Skipping this "
+                f"listing. {self.processed_count} listings processed so far."
+            )
+            return
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping {listing_url}: {e}")
+            return
+        except PageNavigationLimitReached:
+            raise
+        except Exception as e:
+            # One bad listing must not stop the run or discard the saved batches
+            logger.error(f"Failed to process {listing_url}: {e}. Skipping.")
+            return
+        await self.scraped.put(listing_details)
+        self.processed_count += 1
+
+
+async def _gather_watching_writer(
+    tasks: list[asyncio.Task[None]], writer: asyncio.Task[None]
+) -> None:
+    """
+    Wait for the producer and workers, failing fast if the writer stops first.
+
+    Once the writer is gone nothing drains the queue, so workers blocked on a
+    full queue would wait forever and the writer's error would never surface.
+    """
+    scraping = asyncio.gather(*tasks)
+    # The caller cancels the tasks when the writer fails first, so mark the
+    # gather's outcome as read to keep asyncio from logging it
+    scraping.add_done_callback(lambda f: f.cancelled() or f.exception())
+    done, _ = await asyncio.wait(
+        {scraping, writer}, return_when=asyncio.FIRST_COMPLETED
+    )
+    if scraping in done:
+        scraping.result()
+        return
+    # Re-raises the writer's error, if it had one
+    writer.result()
+    raise RuntimeError("Listing writer stopped before scraping finished.")
+
+
+async def _stop_writer(
+    writer: asyncio.Task[None], queue: asyncio.Queue[dict | None], drain: bool
+) -> None:
+    """Let the writer save what is queued and finish, or cancel it outright."""
+    if writer.done():
+        # A writer that already failed re-raises here; put() could block forever
+        await writer
+    elif drain:
+        await queue.put(None)
+        await writer
+    else:
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+
+
+async def _save_queued_listings(
+    queue: asyncio.Queue[dict | None], session: AsyncSession
+) -> None:
+    """
+    Save listings from the queue until it yields None.
+
+    A batch is written and committed once it reaches ``listing_insert_max_rows``
+    listings or ``listing_insert_wait_time`` seconds after its first listing
+    arrived, whichever comes first.
+    """
+    config = get_config()
+    loop = asyncio.get_running_loop()
+    done = False
+    while not done:
+        listing = await queue.get()
+        if listing is None:
+            return
+        batch = [listing]
+        deadline = loop.time() + config.listing_insert_wait_time
+        while len(batch) < config.listing_insert_max_rows:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                listing = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                break
+            if listing is None:
+                done = True
+                break
+            batch.append(listing)
+        try:
+            await save_listings_to_db(batch, session)
+            # Commit per batch so a later failure keeps what was saved, and so
+            # the unique-index locks on these links are not held for the run
+            await session.commit()
+        except Exception as e:
+            # Keep draining so scrapers blocked on a full queue are not stuck
+            logger.error(f"Error saving {len(batch)} listings: {e}")
+            await session.rollback()
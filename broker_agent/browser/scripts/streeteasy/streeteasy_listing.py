@@ -1,66 +1,132 @@
 import asyncio
-import random
 import re
+import uuid
+from contextlib import suppress
 from datetime import datetime
+from urllib.parse import urlparse
 
 from playwright.async_api import Page
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from sqlalchemy import insert, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from broker_agent.browser.utils import get_text_content_with_timeout
-from broker_agent.common.exceptions import PageNavigationLimitReached
-from broker_agent.common.utils import random_extra_click, random_human_delay
+from broker_agent.common.circuit_breaker import CircuitBreaker
+from broker_agent.common.exceptions import CircuitOpenError, PageNavigationLimitReached
+from broker_agent.common.utils import (
+    normalize_tag_names,
+    prefetch_existing_links,
+    random_extra_click,
+    random_human_delay,
+    run_with_retries,
+    save_apartment_tags,
+)
 from broker_agent.config.logging import get_logger
+from broker_agent.config.settings import get_config
 from database.alembic.models.models import Apartment, PriceHistory
-from storage.minio_client import connector as minio_connector
+from database.connection import bulk_copy_apartments
+from storage.minio_client import get_connector
 
 logger = get_logger(__name__)
 
+_PROPERTY_DETAILS_SELECTOR = (
+    '[data-testid="propertyDetails"] .PropertyDetails_item__4mGTQ .Body_base_gyzqw'
+)
+_SQFT_RE = re.compile(r"([\d,]+)\s*ft²")
+_BEDS_RE = re.compile(r"(\d+)\s*beds?")
+_BATHS_RE = re.compile(r"(\d+)\s*baths?")
 
-async def process_streeteasy_listing(
-    page: Page, listing_url: str, session: AsyncSession
-):
+# Listing navigations fail fast once a host has failed repeatedly
+_NAVIGATION_BREAKER = CircuitBreaker(failure_threshold=5, reset_timeout=60.0)
+
+# Images beyond this many per listing are not uploaded or stored
+_MAX_IMAGES_PER_LISTING = 20
+
+# Batches at least this large are loaded with COPY instead of INSERT
+_COPY_MIN_ROWS = 50
+
+_LISTING_DETAIL_SELECTORS: dict[str, str] = {
+    "name": '[data-testid="homeAddress"]',
+    "price": '[data-testid="priceInfo"]',
+    "description": '[data-testid="about-section"]',
+    "available_date": '[data-testid="rentalListingSpec-available"]',
+    "days_on_market": '[data-testid="rentalListingSpec-daysOnMarket"]',
+}
+
+# Sections whose list items are saved as the listing's tags
+_TAG_SECTION_SELECTORS = (
+    '[data-testid="home-features-section"]',
+    '[data-testid="building-amenities-section"]',
+)
+
+
+async def scrape_streeteasy_listing(page: Page, listing_url: str) -> dict[str, any]:
     """
-    Helper function to process a single listing.
-    Throws PageNavigationLimitReached if navigation limit is reached.
+    Navigate to a single listing and scrape its details, without touching the database.
+    Throws PageNavigationLimitReached if navigation limit is reached, and
+    CircuitOpenError without navigating if the listing's host keeps failing.
     """
+    host = urlparse(listing_url).netloc
+    if not _NAVIGATION_BREAKER.allow(host):
+        raise CircuitOpenError(f"Too many failed navigations to {host}.")
+
+    async def navigate() -> None:
+        try:
+            await page.goto(listing_url, timeout=60000, wait_until="domcontentloaded")
+        except Exception as e:
+            if "Page.navigate limit reached" in str(e):
+                raise PageNavigationLimitReached(
+                    "Page navigation limit reached."
+                ) from e
+            raise
+
+    config = get_config()
     try:
-        await page.goto(listing_url, timeout=60000, wait_until="domcontentloaded")
+        await run_with_retries(
+            action=navigate,
+            max_retries=config.streeteasy_max_retries,
+            base_delay=config.streeteasy_base_delay,
+            max_delay=config.streeteasy_max_delay,
+            logger=logger,
+            action_name=f"navigate to {listing_url}",
+            fatal_exceptions=(PageNavigationLimitReached,),
+        )
+    except PageNavigationLimitReached:
+        logger.error(f"Failed to process listing {listing_url}: navigation limit")
+        raise
+    except Exception as e:
+        _NAVIGATION_BREAKER.record_failure(host)
+        logger.error(f"Failed to process listing {listing_url}: {e}")
+        raise
+    _NAVIGATION_BREAKER.record_success(host)
+
+    try:
+        # Start scraping once the listing has rendered rather than after a fixed pause
+        with suppress(PlaywrightTimeoutError):
+            await page.locator(_LISTING_DETAIL_SELECTORS["price"]).wait_for(
+                state="attached", timeout=5000
+            )
         listing_details = await scrape_listing_details(page)
         listing_details["link"] = listing_url
         logger.info(f"Successfully scraped: {listing_url}. Details: {listing_details}")
-        await save_listings_to_db([listing_details], session)
-        await page.wait_for_timeout(2000)
+        return listing_details
     except Exception as e:
         logger.error(f"Failed to process listing {listing_url}: {e}")
-        if "Page.navigate limit reached" in str(e):
-            raise PageNavigationLimitReached("Page navigation limit reached.") from e
-        else:
-            raise
+        raise
 
 
 # TODO: Add a domain object for apartment data
 async def scrape_listing_details(page: Page) -> dict[str, any]:
     logger.info("Scraping listing details")
-    selectors = {
-        "name": '[data-testid="homeAddress"]',
-        "price": '[data-testid="priceInfo"]',
-        "description": '[data-testid="about-section"]',
-        "available_date": '[data-testid="rentalListingSpec-available"]',
-        "days_on_market": '[data-testid="rentalListingSpec-daysOnMarket"]',
-        "policies": '[data-testid="home-features-section"]',
-        "home_features": '[data-testid="home-features-section"]',
-        "ammenities": '[data-testid="building-amenities-section"]',
-    }
-    apartment_data = {key: None for key in selectors.keys()}
+    apartment_data = dict.fromkeys(_LISTING_DETAIL_SELECTORS)
 
     await random_extra_click(page)
     await random_human_delay(300, 1200)
 
     tasks = {
         field: get_text_content_with_timeout(page, selector)
-        for field, selector in selectors.items()
+        for field, selector in _LISTING_DETAIL_SELECTORS.items()
     }
     results = await asyncio.gather(*tasks.values())
 
@@ -68,16 +134,16 @@ async def scrape_listing_details(page: Page) -> dict[str, any]:
         apartment_data[field] = result
 
     await random_human_delay(200, 800)
-    sqft, num_beds, num_baths, neighborhood = await asyncio.gather(
-        extract_sqft(page),
-        extract_num_beds(page),
-        extract_num_baths(page),
+    (sqft, num_beds, num_baths), neighborhood, tags = await asyncio.gather(
+        extract_property_details(page),
         extract_neighborhood(page),
+        get_listing_tags(page),
     )
     apartment_data["sqft"] = sqft
     apartment_data["num_beds"] = num_beds
     apartment_data["num_baths"] = num_baths
     apartment_data["neighborhood"] = neighborhood
+    apartment_data["tags"] = tags
 
     await random_extra_click(page)
     await random_human_delay(200, 900)
@@ -123,75 +189,49 @@ async def extract_neighborhood(page: Page) -> str | None:
     return None
 
 
-async def extract_sqft(page: Page) -> int | None:
+async def extract_property_details(
+    page: Page,
+) -> tuple[int | None, int | None, int | None]:
     """
-    Extracts the square footage (int) from the property details section, or None if not found.
+    Extracts the square footage, number of bedrooms and number of bathrooms (ints)
+    from the property details section, with None for any that are not found.
     """
     try:
         await random_extra_click(page)
         await random_human_delay(100, 400)
 
-        property_details_selector = '[data-testid="propertyDetails"] .PropertyDetails_item__4mGTQ .Body_base_gyzqw'
-        property_details = await page.query_selector_all(property_details_selector)
-        for detail in property_details:
-            text = await detail.text_content()
-            if not text:
-                continue
-            sqft_match = re.match(r"([\d,]+)\s*ft²", text)
-            if sqft_match:
-                try:
-                    return int(sqft_match.group(1).replace(",", ""))
-                except Exception:
-                    return None
+        # One round-trip for every item instead of one per element and field
+        texts = await page.locator(_PROPERTY_DETAILS_SELECTOR).all_text_contents()
     except Exception as e:
-        logger.warning(f"Failed to extract sqft: {e}")
-    return None
-
+        logger.warning(f"Failed to extract property details: {e}")
+        return None, None, None
 
-async def extract_num_beds(page: Page) -> int | None:
-    """
-    Extracts the number of bedrooms (int) from the property details section, or None if not found.
-    """
-    try:
-        await random_human_delay(100, 400)
-        property_details_selector = '[data-testid="propertyDetails"] .PropertyDetails_item__4mGTQ .Body_base_gyzqw'
-        property_details = await page.query_selector_all(property_details_selector)
-        for detail in property_details:
-            text = await detail.text_content()
-            if not text:
-                continue
-            beds_match = re.match(r"(\d+)\s*beds?", text)
-            if beds_match:
-                try:
-                    return int(beds_match.group(1))
-                except Exception:
-                    return None
-    except Exception as e:
-        logger.warning(f"Failed to extract num_beds: {e}")
-    return None
+    sqft = num_beds = num_baths = None
+    for text in texts:
+        if sqft is None and (sqft_match := _SQFT_RE.match(text)):
+            sqft = int(sqft_match.group(1).replace(",", ""))
+        elif num_beds is None and (beds_match := _BEDS_RE.match(text)):
+            num_beds = int(beds_match.group(1))
+        elif num_baths is None and (baths_match := _BATHS_RE.match(text)):
+            num_baths = int(baths_match.group(1))
+    return sqft, num_beds, num_baths
 
 
-async def extract_num_baths(page: Page) -> int | None:
+async def get_listing_tags(page: Page) -> list[str]:
     """
-    Extracts the number of bathrooms (int) from the property details section, or None if not found.
+    Returns the distinct home feature and building amenity names on the listing.
     """
     try:
-        await random_human_delay(100, 400)
-        property_details_selector = '[data-testid="propertyDetails"] .PropertyDetails_item__4mGTQ .Body_base_gyzqw'
-        property_details = await page.query_selector_all(property_details_selector)
-        for detail in property_details:
-            text = await detail.text_content()
-            if not text:
-                continue
-            baths_match = re.match(r"(\d+)\s*baths?", text)
-            if baths_match:
-                try:
-                    return int(baths_match.group(1))
-                except Exception:
-                    return None
+        texts = await asyncio.gather(
+            *(
+                page.locator(f"{selector} li").all_text_contents()
+                for selector in _TAG_SECTION_SELECTORS
+            )
+        )
     except Exception as e:
-        logger.warning(f"Failed to extract num_baths: {e}")
-    return None
+        logger.error(f"Error extracting listing tags: {e}")
+        return []
+    return normalize_tag_names(text for section in texts for text in section)
 
 
 async def get_price_history(page: Page) -> list[dict[str, datetime | float]]:
@@ -293,10 +333,9 @@ async def get_image_urls(page: Page) -> list[str]:
     while True:
         try:
             # Look for images with alt text pattern "photo n"
-            selector = (
-                f"img[alt='photo {current_photo_num}'][class*='MediaCarousel_contain']"
+            image_element = await page.query_selector(
+                _photo_selector(current_photo_num)
             )
-            image_element = await page.query_selector(selector)
 
             if not image_element:
                 break
@@ -319,9 +358,12 @@ async def get_image_urls(page: Page) -> list[str]:
             await random_human_delay(200, 800)
             await next_button.click(timeout=10000)
             await random_human_delay(200, 800)
-            await page.wait_for_timeout(
-                random.randint(300, 800)
-            )  # Small delay for image to load
+            # Continue as soon as the next image is in the DOM; if it never shows
+            # up, the lookup at the top of the loop ends the carousel walk
+            with suppress(PlaywrightTimeoutError):
+                await page.locator(_photo_selector(current_photo_num)).wait_for(
+                    state="attached", timeout=5000
+                )
 
         except Exception as e:
             logger.error(f"Error getting image URL for photo {current_photo_num}: {e}")
@@ -331,104 +373,184 @@ async def get_image_urls(page: Page) -> list[str]:
     return list(image_urls)
 
 
+def _photo_selector(photo_num: int) -> str:
+    return f"img[alt='photo {photo_num}'][class*='MediaCarousel_contain']"
+
+
 async def save_listings_to_db(listings: list[dict[str, any]], session: AsyncSession):
     """
     Save apartment listings to the database.
 
+    Links already in the database are filtered out with one query before any
+    images are uploaded, and the remaining listings are written with a single
+    multi-row INSERT, followed by their price history and tags. Listings saved
+    concurrently by another scraper are upserted with ``ON CONFLICT (link) DO
+    UPDATE``, refreshing their price and scrape date.
+    A listing that cannot be processed is logged and skipped without affecting
+    the rest of the batch.
+
+    Nothing is committed here: the batch joins the session's open transaction
+    and the caller decides when to commit.
+
     Args:
         listings: List of listing details to save
         Session: SQLAlchemy sessionmaker
     """
-    # Use a with block to manage the session lifecycle
-    for listing in listings:
-        try:
-            await random_human_delay(100, 400)
-            # Check if the apartment already exists
-            if not await _apartment_exists(session, listing):
-                # Process and add the apartment
-                await _process_and_add_apartment(session, listing)
-        except IntegrityError as conflict_error:
-            await session.rollback()
-            logger.warning(
-                f"Conflict or unique violation for listing {listing.get('link', 'unknown')}: {conflict_error}"
-            )
-            continue  # Continue with the next listing
-        except Exception as e:
-            await session.rollback()
-            logger.error(
-                f"Error processing listing {listing.get('link', 'unknown')}: {e}"
-            )
-            continue  # Continue with the next listing
+    if not listings:
+        return
+
+    existing_links = await prefetch_existing_links(
+        session, [listing["link"] for listing in listings]
+    )
+    # Keyed by link so a batch never upserts the same row twice
+    new_listings = list(
+        {
+            listing["link"]: listing
+            for listing in listings
+            if listing["link"] not in existing_links
+        }.values()
+    )
+    if not new_listings:
+        return
+
+    built = await _build_rows(new_listings)
+    if not built:
+        return
 
-    # Commit the session at the end
     try:
-        await session.commit()
+        # The batch is written in a savepoint so a failure rolls back only this
+        # batch, leaving the rest of the caller's transaction intact
+        async with session.begin_nested():
+            await _write_batch(session, built)
     except Exception as e:
-        await session.rollback()
-        logger.error(f"Error committing to database: {e}")
+        logger.error(f"Error saving {len(built)} listings to database: {e}")
 
 
-async def _apartment_exists(db_session: AsyncSession, listing: dict[str, any]) -> bool:
+async def _build_rows(
+    listings: list[dict[str, any]],
+) -> list[tuple[dict[str, any], dict[str, any]]]:
     """
-    Check if an apartment with the given link already exists in the database asynchronously.
-
-    Args:
-        db_session: SQLAlchemy AsyncSession
-        listing: Apartment listing data
+    Build the apartment rows for a batch concurrently, uploading their images.
 
-    Returns:
-        True if apartment exists, False otherwise
+    Returns (row, listing) pairs; listings that fail to build are logged and left out.
     """
-    stmt = select(Apartment).where(Apartment.link == listing["link"])
-    result = await db_session.execute(stmt)
-    existing_apartment = result.scalars().first()
-    return existing_apartment is not None
+    built = await asyncio.gather(
+        *(_build_apartment_row(listing) for listing in listings),
+        return_exceptions=True,
+    )
+    pairs = []
+    for listing, row in zip(listings, built, strict=True):
+        if isinstance(row, BaseException):
+            logger.error(
+                f"Error processing listing {listing.get('link', 'unknown')}: {row}"
+            )
+            continue
+        pairs.append((row, listing))
+    return pairs
 
 
-async def _process_and_add_apartment(
-    db_session: AsyncSession, listing: dict[str, any]
+async def _write_batch(
+    session: AsyncSession, built: list[tuple[dict[str, any], dict[str, any]]]
 ) -> None:
     """
-    Process listing data, upload images to Minio, and add a new apartment to the database.
+    Insert a batch of apartment rows, then the price history and tags of the
+    apartments that were newly inserted.
+    """
+    rows = [row for row, _ in built]
+    inserted_links = await _insert_apartments(session, rows)
+    inserted = [
+        (row, listing) for row, listing in built if row["link"] in inserted_links
+    ]
+    # Apartment IDs are generated client-side, so price history can
+    # reference them without reading them back from the database
+    price_history_rows = [
+        {
+            "price_history_id": uuid.uuid4(),
+            "apartment_id": row["apartment_id"],
+            "price": price_point["price"],
+            "date": price_point["date"],
+        }
+        for row, listing in inserted
+        for price_point in listing.get("price_history") or []
+    ]
+    if price_history_rows:
+        await session.execute(insert(PriceHistory), price_history_rows)
+    await save_apartment_tags(
+        session,
+        {row["apartment_id"]: listing.get("tags") or [] for row, listing in inserted},
+    )
+
+
+async def _insert_apartments(
+    session: AsyncSession, rows: list[dict[str, any]]
+) -> set[str]:
+    """
+    Insert apartment rows, with COPY for large batches and an upsert otherwise.
+
+    Returns the links of the rows that were newly inserted rather than updated.
+    """
+    if len(rows) >= _COPY_MIN_ROWS:
+        try:
+            async with session.begin_nested():
+                copied = await bulk_copy_apartments(session, rows)
+            return {link for _, link in copied}
+        except Exception as e:
+            # Most likely a link saved concurrently by another scraper
+            logger.warning(f"COPY of {len(rows)} listings failed, using INSERT: {e}")
+    stmt = pg_insert(Apartment)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["link"],
+        set_={
+            "date_scraped": stmt.excluded.date_scraped,
+            "price": stmt.excluded.price,
+        },
+    ).returning(Apartment.link, literal_column("xmax = 0"))
+    result = await session.execute(stmt, rows)
+    # Rows that already existed only get their price refreshed; their
+    # price history was saved when they were first inserted
+    return {link for link, is_new in result.all() if is_new}
+
+
+async def _build_apartment_row(listing: dict[str, any]) -> dict[str, any]:
+    """
+    Process listing data and upload images to Minio, returning the apartment's column values.
 
     Args:
-        db_session: SQLAlchemy AsyncSession
         listing: Apartment listing data
+
+    Returns:
+        Column values for a new row in the apartments table
     """
     days_on_market = _extract_days_on_market(listing)
     available_date = _parse_available_date(listing)
     price = _parse_price(listing)
 
+    # Order-preserving dedup, so repeated images are neither uploaded nor stored twice
+    image_urls = list(dict.fromkeys(listing.get("image_urls", [])))
+    image_urls = image_urls[:_MAX_IMAGES_PER_LISTING]
+    # Query strings on listing links are only tracking parameters
+    similar_listings = list(
+        dict.fromkeys(
+            link.split("?", 1)[0] for link in listing["similar_listings"] or []
+        )
+    )
+
     # Download images and upload to Minio concurrently
-    image_tasks = [
-        minio_connector.download_image(url) for url in listing.get("image_urls", [])
-    ]
-    minio_results = await asyncio.gather(*image_tasks)
+    minio_results = await get_connector().download_images(image_urls)
     minio_image_urls = [url for url in minio_results if url is not None]
 
-    new_apartment = Apartment(
-        name=listing["name"],
-        price=price,
-        description=listing["description"],
-        available_date=available_date,
-        days_on_market=days_on_market,
-        link=listing["link"],
-        image_urls=minio_image_urls,
-        similar_listings=listing["similar_listings"],
-    )
-    db_session.add(new_apartment)
-    await db_session.flush()
-
-    # Process price history if available
-    if "price_history" in listing and listing["price_history"]:
-        for price_point in listing["price_history"]:
-            price_history_entry = PriceHistory(
-                apartment_id=new_apartment.apartment_id,
-                price=price_point["price"],
-                date=price_point["date"],
-            )
-            db_session.add(price_history_entry)
-        await db_session.flush()
+    return {
+        "apartment_id": uuid.uuid4(),
+        "date_scraped": datetime.now(),
+        "name": listing["name"],
+        "price": price,
+        "description": listing["description"],
+        "available_date": available_date,
+        "days_on_market": days_on_market,
+        "link": listing["link"],
+        "image_urls": minio_image_urls,
+        "similar_listings": similar_listings,
+    }
 
 
 def _extract_days_on_market(listing: dict[str, any]) -> int:
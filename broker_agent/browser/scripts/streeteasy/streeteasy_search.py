@@ -1,12 +1,13 @@
 import asyncio
 import random
+from collections.abc import AsyncIterator
 
 from playwright.async_api import Page
 
 from broker_agent.common.enum import ApartmentType
 from broker_agent.common.utils import random_human_delay
 from broker_agent.config.logging import get_logger
-from broker_agent.config.settings import config
+from broker_agent.config.settings import get_config
 
 logger = get_logger(__name__)
 
@@ -109,37 +110,47 @@ async def _click_next_page_with_retries(
             await asyncio.sleep(actual_delay)
 
 
-async def streeteasy_save_listings(
+async def streeteasy_iter_listings(
     page: Page,
-    max_depth: int = config.streeteasy_max_depth,
-    base_delay: float = config.streeteasy_base_delay,
-    max_delay: float = config.streeteasy_max_delay,
-    max_retries: int = config.streeteasy_max_retries,
-) -> list[str]:
-    """Scrape StreetEasy search result pages up to *max_depth* and collect listing URLs.
+    max_depth: int | None = None,
+    base_delay: float | None = None,
+    max_delay: float | None = None,
+    max_retries: int | None = None,
+) -> AsyncIterator[list[str]]:
+    """Scrape StreetEasy search result pages up to *max_depth*, yielding listing URLs per page.
+
+    Each results page's new links are yielded as soon as the page is read, so the
+    caller can start on them while the next page is being loaded.
 
     Args:
         page (Page): The Playwright page instance pointing at the StreetEasy search results.
-        max_depth (int, optional): Number of pagination pages to traverse. Defaults to the
+        max_depth (int | None, optional): Number of pagination pages to traverse. Defaults to the
             value configured in ``default.yaml`` via ``streeteasy_max_depth``.
-        base_delay (float, optional): Starting delay in seconds. Defaults to the value
+        base_delay (float | None, optional): Starting delay in seconds. Defaults to the value
             configured in ``default.yaml`` via ``streeteasy_base_delay``.
-        max_delay (float, optional): Maximum delay in seconds. Defaults to the value
+        max_delay (float | None, optional): Maximum delay in seconds. Defaults to the value
             configured in ``default.yaml`` via ``streeteasy_max_delay``.
-        max_retries (int, optional): Maximum number of retries. Defaults to the value
+        max_retries (int | None, optional): Maximum number of retries. Defaults to the value
             configured in ``default.yaml`` via ``streeteasy_max_retries``.
 
-    Returns:
-        list[str]: A list of unique listing URLs discovered.
+    Yields:
+        list[str]: The listing URLs on each results page not seen on an earlier page.
     """
+    config = get_config()
+    max_depth = config.streeteasy_max_depth if max_depth is None else max_depth
+    base_delay = config.streeteasy_base_delay if base_delay is None else base_delay
+    max_delay = config.streeteasy_max_delay if max_delay is None else max_delay
+    max_retries = config.streeteasy_max_retries if max_retries is None else max_retries
 
     links: set[str] = set()
     i = 0
 
     while i < max_depth:
         # Extract links from the current page
-        page_links = await _extract_listing_links_from_page(page)
+        page_links = list(await _extract_listing_links_from_page(page) - links)
         links.update(page_links)
+        if page_links:
+            yield page_links
 
         # Check for pagination region
         pagination = page.get_by_role("region", name="Pagination")
@@ -157,5 +168,3 @@ async def streeteasy_save_listings(
         await random_human_delay(400, 1200)
         await asyncio.sleep(base_delay + (i * 1.5))
         i += 1
-
-    return list(links)
@@ -1,14 +1,35 @@
-import asyncio
 import random
 import re
+from functools import cache
+from itertools import accumulate
 
-from playwright.async_api import Page
+from playwright.async_api import Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from broker_agent.config.logging import get_logger
+from broker_agent.config.settings import get_config
 
 logger = get_logger(__name__)
 
 
+@cache
+def _blocked_resource_types() -> frozenset[str]:
+    """Resource types aborted by ``route_handler``, read from config on first use."""
+    settings = get_config().browser_settings
+    if not settings.block_resources:
+        return frozenset()
+    return frozenset(settings.block_resource_types)
+
+
+@cache
+def _blocked_url_patterns() -> tuple[re.Pattern[str], ...]:
+    """Compiled URL patterns aborted by ``route_handler``."""
+    return tuple(
+        re.compile(pattern)
+        for pattern in get_config().browser_settings.blocked_url_patterns
+    )
+
+
 # TODO: May need to filter a11y tree to ensure best model understanding
 def format_a11y_tree(tree_data):
     """Format an accessibility tree for better readability."""
@@ -70,10 +91,11 @@ async def get_text_content_with_timeout(
     page: Page, selector: str, timeout_s: float = 5.0
 ) -> str | None:
     try:
-        locator = page.locator(selector)
-        content = await asyncio.wait_for(locator.text_content(), timeout=timeout_s)
+        content = await page.locator(selector).text_content(
+            timeout=int(timeout_s * 1000)
+        )
         return content.strip() if content else None
-    except TimeoutError:
+    except (PlaywrightTimeoutError, TimeoutError):
         logger.debug(f"Timeout getting text content for {selector}")
         return None
     except Exception as e:
@@ -81,20 +103,29 @@ async def get_text_content_with_timeout(
         return None
 
 
-def generate_random_user_agent():
+_UA_POOL_SIZE = 256
+
+# Desktop OS strings weighted roughly by their share of Chrome traffic, so the pool
+# looks like a real visitor mix rather than a uniform spread
+_UA_OS_WEIGHTS: tuple[tuple[str, float], ...] = (
+    ("Windows NT 10.0; Win64; x64", 0.60),
+    ("Windows NT 10.0; WOW64", 0.04),
+    ("Windows NT 6.1; Win64; x64", 0.02),
+    ("Macintosh; Intel Mac OS X 10_15_7", 0.24),
+    ("Macintosh; Intel Mac OS X 11_2_3", 0.03),
+    ("X11; Linux x86_64", 0.07),
+)
+_UA_OS_OPTIONS: tuple[str, ...] = tuple(os_str for os_str, _ in _UA_OS_WEIGHTS)
+_UA_OS_CUM_WEIGHTS: tuple[float, ...] = tuple(
+    accumulate(weight for _, weight in _UA_OS_WEIGHTS)
+)
+
+
+def _build_user_agent() -> str:
     """
-    Generate a random plausible Chrome-based user agent string.
+    Build a random plausible Chrome-based user agent string.
     """
-    # OS options
-    os_options = [
-        "Windows NT 10.0; Win64; x64",
-        "Windows NT 10.0; WOW64",
-        "Windows NT 6.1; Win64; x64",
-        "Macintosh; Intel Mac OS X 10_15_7",
-        "Macintosh; Intel Mac OS X 11_2_3",
-        "X11; Linux x86_64",
-    ]
-    os_str = random.choice(os_options)
+    os_str = random.choices(_UA_OS_OPTIONS, cum_weights=_UA_OS_CUM_WEIGHTS)[0]
 
     # Chrome version
     chrome_major = random.randint(90, 120)
@@ -112,9 +143,98 @@ def generate_random_user_agent():
     safari_minor = random.randint(36, 50)
     safari_version = f"{safari_major}.{safari_minor}"
 
-    user_agent = (
+    return (
         f"Mozilla/5.0 ({os_str}) "
         f"AppleWebKit/{webkit_version} (KHTML, like Gecko) "
         f"Chrome/{chrome_version} Safari/{safari_version}"
     )
-    return user_agent
+
+
+# Generated once per process so the distribution stays stable across a run
+_UA_POOL: tuple[str, ...] = tuple(_build_user_agent() for _ in range(_UA_POOL_SIZE))
+
+
+def pick_user_agent() -> str:
+    """
+    Pick a user agent from the pre-generated pool.
+    """
+    return random.choice(_UA_POOL)
+
+
+class UserAgentRotator:
+    """
+    Hands out user agents from the pre-generated pool in a shuffled order.
+
+    Every agent is used once per pass and the order is reshuffled after each full
+    pass, so consecutive retries never repeat an agent and the sequence does not
+    settle into a fixed cycle. ``next`` never awaits, so it is safe to share a
+    rotator between tasks on one event loop without a lock.
+    """
+
+    def __init__(
+        self,
+        user_agents: tuple[str, ...] = _UA_POOL,
+        rng: random.Random | None = None,
+    ):
+        self._user_agents = user_agents
+        self._rng = rng or random.Random()
+        self._order: list[str] = []
+        self._index = 0
+        self._reshuffle()
+
+    def next(self) -> str:
+        """Return the next user agent, reshuffling once the pass is exhausted."""
+        if self._index >= len(self._order):
+            self._reshuffle()
+        user_agent = self._order[self._index]
+        self._index += 1
+        return user_agent
+
+    def _reshuffle(self) -> None:
+        self._order = self._rng.sample(self._user_agents, len(self._user_agents))
+        self._index = 0
+
+
+def generate_random_user_agent() -> str:
+    """
+    Generate a random plausible Chrome-based user agent string.
+    """
+    return pick_user_agent()
+
+
+def get_browser_context_config(user_agent: str) -> dict:
+    """Helper to generate a randomized browser context configuration."""
+    settings = get_config().browser_settings
+    viewport = random.choice(settings.viewport_sizes)
+    timezone_id = random.choice(settings.timezones)
+    return {
+        "user_agent": user_agent,
+        "viewport": viewport,
+        "locale": "en-US",
+        "timezone_id": timezone_id,
+        "device_scale_factor": random.choice([1, 2]),
+        "has_touch": random.choice([True, False]),
+        "permissions": ["geolocation"],
+        "java_script_enabled": True,
+        "bypass_csp": True,
+    }
+
+
+async def route_handler(route: Route) -> None:
+    """
+    Helper function to handle routing for blocking URLs and controlling resource loading.
+    Blocks the resource types configured in browser settings (images by default).
+    """
+    request_url = route.request.url
+    resource_type = route.request.resource_type
+
+    # Block URLs based on patterns
+    if any(pattern.match(request_url) for pattern in _blocked_url_patterns()):
+        await route.abort()
+        return
+
+    if resource_type in _blocked_resource_types():
+        await route.abort()
+        return
+
+    await route.continue_()
@@ -1,22 +1,25 @@
 import asyncio
+import logging
 import traceback
+from uuid import UUID
 
 import click
-from ollama import ChatResponse
-from sqlalchemy import select
+from ollama import AsyncClient, ChatResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from broker_agent.common.enum import LLMType
-from broker_agent.common.utils import get_all_imgs_by_apt_id_as_base64
+from broker_agent.common.utils import fetch_imgs_as_bytes, get_all_imgs_by_apt_ids
 from broker_agent.config.logging import configure_logging, get_logger
-from broker_agent.config.settings import config
-from broker_agent.llm.client import get_llm
+from broker_agent.config.settings import get_config
+from broker_agent.llm.client import get_llm, ollama_vision_client
 from database.alembic.models.models import Apartment
 from database.connection import async_db_session
 
-configure_logging(log_level=config.log_level)
-
 logger = get_logger(__name__)
 
+_APARTMENT_ID_BATCH_SIZE = 128
+_COMMIT_BATCH_SIZE = 32
+
 
 async def analyze_img_by_urls(img_urls: list[str]) -> str:
     """
@@ -31,17 +34,10 @@ async def analyze_img_by_urls(img_urls: list[str]) -> str:
     """
     llm = get_llm()
 
-    prompt = config.image_analysis.prompt
-
-    content = [{"type": "text", "text": prompt}]
-    for url in img_urls:
-        content.append(
-            {
-                "type": "image",
-                "source_type": "url",
-                "url": url,
-            }
-        )
+    content = [
+        {"type": "text", "text": get_config().image_analysis.prompt},
+        *({"type": "image", "source_type": "url", "url": url} for url in img_urls),
+    ]
 
     message = {
         "role": "user",
@@ -52,7 +48,9 @@ async def analyze_img_by_urls(img_urls: list[str]) -> str:
     return response.content
 
 
-async def analyze_img_by_base64(img_base64_list: list[dict]) -> str | None:
+async def analyze_img_by_base64(
+    img_base64_list: list[dict], vision_llm: AsyncClient | None = None
+) -> str | None:
     """
     Analyze a list of apartment images (as base64) and return a description using
     the configured prompt template from image_analysis.yaml.
@@ -64,10 +62,16 @@ async def analyze_img_by_base64(img_base64_list: list[dict]) -> str | None:
                 "mime_type": "image/jpeg"  # or "image/png", etc.
             }
 
+        vision_llm: Open vision client to send the request with; a short-lived
+            one is opened when omitted
+
     Returns:
         str: Description of the apartment
     """
-    vision_llm = get_llm(model_name=config.vision_llm, llm_type=LLMType.OLLAMA_VLM)
+    if vision_llm is None:
+        async with ollama_vision_client() as client:
+            return await analyze_img_by_base64(img_base64_list, client)
+    config = get_config()
     images = [img["data"] for img in img_base64_list if "data" in img]
 
     message = [
@@ -87,57 +91,149 @@ async def analyze_img_by_base64(img_base64_list: list[dict]) -> str | None:
     return response.message.content
 
 
-async def async_run_analyze_apt_imgs() -> None:
+async def analyze_img_by_bytes(
+    images: list[bytes], vision_llm: AsyncClient | None = None
+) -> str | None:
+    """
+    Analyze a list of apartment images (as raw bytes) and return a description using
+    the configured prompt template from image_analysis.yaml.
+
+    Args:
+        images: List of raw image data, e.g. JPEG or PNG bytes
+
+        vision_llm: Open vision client to send the request with; a short-lived
+            one is opened when omitted
+
+    Returns:
+        str: Description of the apartment
+    """
+    if vision_llm is None:
+        async with ollama_vision_client() as client:
+            return await analyze_img_by_bytes(images, client)
+    config = get_config()
+
+    message = [
+        {
+            "role": "user",
+            "content": config.image_analysis.prompt,
+            "images": images,
+        }
+    ]
+
+    response: ChatResponse = await vision_llm.chat(
+        model=config.vision_llm, messages=message
+    )
+    if not response.message.content:
+        logger.warning("No response from vision LLM for image")
+        return None
+    return response.message.content
+
+
+async def async_run_analyze_apt_imgs(force: bool = False) -> None:
     """
-    Analyze images for all apartments in the database.
+    Analyze images for all apartments in the database that have no AI summary yet.
     For each apartment:
     1. Retrieve all image URLs
     2. Analyze the images using the LLM
-    3. Update the ai_summary field in the database
+    3. Update the ai_summary field in the database, committing in batches
     4. Print the results
+
+    Args:
+        force: Re-analyze apartments that already have an ``ai_summary``.
+    """
+    # Apartments without images have nothing to analyze, so they are never fetched
+    stmt_ids = select(Apartment.apartment_id).where(
+        func.cardinality(Apartment.image_urls) > 0
+    )
+    if not force:
+        stmt_ids = stmt_ids.where(Apartment.ai_summary.is_(None))
+
+    # IDs are streamed from a server-side cursor on their own session so that
+    # committing analysis results does not close the cursor mid-iteration.
+    # One vision client serves the whole run and is closed before the loop ends
+    async with (
+        async_db_session() as id_session,
+        async_db_session() as session,
+        ollama_vision_client() as vision_llm,
+    ):
+        apartment_ids = await id_session.stream_scalars(
+            stmt_ids.execution_options(yield_per=_APARTMENT_ID_BATCH_SIZE)
+        )
+
+        pending_updates = 0
+        # Image URLs are looked up for a whole partition of IDs in one query
+        async for apt_id_batch in apartment_ids.partitions():
+            urls_by_apt_id = await get_all_imgs_by_apt_ids(apt_id_batch, session)
+            for apt_id in apt_id_batch:
+                try:
+                    if not await _analyze_apartment(
+                        apt_id, urls_by_apt_id.get(apt_id, []), session, vision_llm
+                    ):
+                        continue
+                    pending_updates += 1
+                    if pending_updates >= _COMMIT_BATCH_SIZE:
+                        await session.commit()
+                        pending_updates = 0
+                except Exception as e:
+                    logger.error(f"Error analyzing apartment ID {apt_id}: {e}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(traceback.format_exc())
+                    # Keep the analyses already finished in this batch; the session
+                    # rolls back anything uncommitted when the error propagates
+                    await _commit_pending(session, pending_updates)
+                    raise
+
+
+async def _analyze_apartment(
+    apt_id: UUID, img_urls: list[str], session: AsyncSession, vision_llm: AsyncClient
+) -> bool:
+    """
+    Analyze one apartment's images and stage its ``ai_summary`` update.
+    Returns whether an update was staged.
     """
-    async with async_db_session() as session:
-        stmt_ids = select(Apartment.apartment_id)
-        result_ids = await session.execute(stmt_ids)
-        apartment_ids = result_ids.scalars().all()
-
-        for apt_id in apartment_ids:
-            try:
-                apt = await session.get(Apartment, apt_id)
-                if apt is None:
-                    logger.warning(
-                        f"Apartment with ID {apt_id} not found during processing, skipping."
-                    )
-                    continue
-
-                imgs = await get_all_imgs_by_apt_id_as_base64(apt_id, session)
-
-                if not imgs:
-                    logger.warning(f"No images found for apartment ID: {apt_id}")
-                    continue
-                logger.info(f"Analyzing {len(imgs)} images for apartment ID: {apt_id}")
-                analysis = await analyze_img_by_base64(imgs)
-
-                if not analysis:
-                    continue
-
-                apt.ai_summary = analysis
-                session.add(apt)
-                await session.commit()
-                await session.refresh(apt)
-
-                # Log the results
-                logger.info(f"Analysis for apartment ID {apt_id}:")
-                logger.info(analysis)
-                logger.info("-" * 50)
-
-            except Exception as e:
-                logger.error(
-                    f"Error analyzing apartment ID {apt_id}: {e}\n{traceback.format_exc()}"
-                )
-                raise e
+    imgs = await fetch_imgs_as_bytes(img_urls)
+
+    if not imgs:
+        logger.warning(f"No images found for apartment ID: {apt_id}")
+        return False
+    logger.info(f"Analyzing {len(imgs)} images for apartment ID: {apt_id}")
+    analysis = await analyze_img_by_bytes(imgs, vision_llm)
+
+    if not analysis:
+        return False
+
+    await session.execute(
+        update(Apartment)
+        .where(Apartment.apartment_id == apt_id)
+        .values(ai_summary=analysis)
+    )
+
+    # Log the results
+    logger.info(f"Analysis for apartment ID {apt_id}:")
+    logger.info(analysis)
+    logger.info("-" * 50)
+    return True
+
+
+async def _commit_pending(session: AsyncSession, pending_updates: int) -> None:
+    """Commit staged analyses, logging rather than raising if that fails."""
+    if not pending_updates:
+        return
+    try:
+        await session.commit()
+    except Exception as commit_error:
+        logger.error(
+            f"Could not save {pending_updates} finished analyses: {commit_error}"
+        )
 
 
 @click.command()
-def run_analyze_apt_imgs() -> None:
-    asyncio.run(async_run_analyze_apt_imgs())
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="Re-analyze apartments that already have an AI summary.",
+)
+def run_analyze_apt_imgs(force: bool) -> None:
+    configure_logging(log_level=get_config().log_level)
+    asyncio.run(async_run_analyze_apt_imgs(force=force))
@@ -1,21 +1,29 @@
 import asyncio
-import logging
-import traceback
+import os
+from contextlib import AsyncExitStack
+from functools import cache
 
 import click
-from playwright.async_api import Playwright, async_playwright
+from playwright.async_api import Browser, Playwright, async_playwright
 
-from broker_agent.browser.utils import generate_random_user_agent
+from broker_agent.browser.context_pool import ContextPool
+from broker_agent.browser.scraping_browser import (
+    connect_shared_browser,
+    launch_shared_browser,
+)
+from broker_agent.browser.utils import UserAgentRotator
 from broker_agent.common.enum import WebsiteType
 from broker_agent.common.exceptions import ScraperAccessDenied
 from broker_agent.common.types import WebsiteScraper
+from broker_agent.common.utils import run_with_retries
 from broker_agent.config.logging import configure_logging, get_logger
-from broker_agent.config.settings import config
+from broker_agent.config.settings import get_config
 from broker_agent.pipeline.tasks import (
     scrape_apartments_dot_com,
     scrape_renthop,
     scrape_streeteasy,
 )
+from storage.minio_client import get_connector
 
 WEBSITE_SCRAPERS: dict[WebsiteType, WebsiteScraper] = {
     WebsiteType.STREETEASY: scrape_streeteasy,
@@ -23,11 +31,26 @@ WEBSITE_SCRAPERS: dict[WebsiteType, WebsiteScraper] = {
     WebsiteType.RENTHOP: scrape_renthop,
 }
 
-configure_logging(log_level=config.LOGGING_LEVEL)
-
 logger = get_logger(__name__)
 
-logging.getLogger("httpx").setLevel(logging.WARNING)
+# Programming errors that retrying with another user agent cannot fix
+_FATAL_SCRAPER_ERRORS: tuple[type[Exception], ...] = (
+    AttributeError,
+    NameError,
+    NotImplementedError,
+    TypeError,
+)
+
+
+@cache
+def _browser_sem() -> asyncio.Semaphore:
+    """Caps concurrent browser work across all websites and instances."""
+    settings = get_config()
+    browsers = settings.parallel_browsers * len(settings.websites)
+    return asyncio.Semaphore(
+        settings.browser_settings.max_concurrent
+        or max(1, min(os.cpu_count() or 1, browsers))
+    )
 
 
 async def async_run_scraper() -> None:
@@ -36,43 +59,76 @@ async def async_run_scraper() -> None:
     The number of parallel browsers per website is defined by ``config.parallel_browsers``
     if present (defaulting to 3). All websites are scraped concurrently, with each website
     having multiple browser instances working on it simultaneously.
+
+    When running a local browser, a single Chromium instance is launched (or, if
+    ``browser_settings.cdp_endpoint`` is set, a persistent one started with
+    ``start_browser`` is connected to) and all scrapers borrow isolated browser
+    contexts on it from a bounded ContextPool.
     """
 
-    async with async_playwright() as playwright:
+    config = get_config()
+    # Let each scraper task run its synchronous prelude immediately on creation
+    asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+    async with async_playwright() as playwright, AsyncExitStack() as stack:
+        stack.push_async_callback(get_connector().aclose)
+        settings = config.browser_settings
+        browser: Browser | None = None
+        if settings.cdp_endpoint:
+            browser = await connect_shared_browser(playwright, settings.cdp_endpoint)
+        elif config.LOCAL_BROWSER:
+            browser = await launch_shared_browser(playwright)
+
+        pool: ContextPool | None = None
+        if browser is not None:
+            stack.push_async_callback(browser.close)
+            # Search pages hold a context while up to listing_concurrency listing
+            # pages borrow more, so size the pool for both per scraper task
+            pool = ContextPool(
+                browser,
+                max_size=settings.context_pool_size
+                or (1 + settings.listing_concurrency)
+                * len(config.websites)
+                * config.parallel_browsers,
+                max_uses=settings.context_max_uses,
+                max_idle_time=settings.context_max_idle_time,
+            )
+            pool.start_cleanup()
+            stack.push_async_callback(pool.close)
+
         all_tasks: list[asyncio.Task[None]] = []
         for website in config.websites:
-            try:
-                website_type = WebsiteType(website)
-            except ValueError:
-                logger.error(f"Website {website} not supported")
-                continue
-
-            scraper_fn = WEBSITE_SCRAPERS.get(website_type)
+            # StrEnum members hash like their values, so the raw URL is the key
+            scraper_fn = WEBSITE_SCRAPERS.get(website)
             if scraper_fn is None:
-                logger.error(
-                    f"Website {website_type} has no scraper implementation configured"
-                )
+                logger.error("Website %s not supported", website)
                 continue
 
             website_tasks = []
             for i in range(config.parallel_browsers):
-                instance_name = f"{website_type.value} (instance {i+1})"
+                instance_name = f"{website} (instance {i + 1})"
                 task = asyncio.create_task(
                     _run_single_scraper(
                         playwright,
                         scraper_fn,
                         instance_name,
+                        pool,
                     )
                 )
                 website_tasks.append(task)
                 all_tasks.append(task)
 
             logger.info(
-                f"Scheduled {len(website_tasks)} parallel scrapers for {website_type.value}"
+                "Scheduled %d parallel scrapers for %s", len(website_tasks), website
             )
 
         if all_tasks:
-            await asyncio.gather(*all_tasks)
+            # Handle scrapers as they finish instead of waiting on the slowest one
+            for next_done in asyncio.as_completed(all_tasks):
+                try:
+                    await next_done
+                except Exception as e:
+                    logger.error("Scraper task failed: %s", e)
         else:
             logger.warning("No valid scraper tasks were scheduled, exiting.")
 
@@ -81,46 +137,41 @@ async def _run_single_scraper(
     playwright: Playwright,
     scraper_fn: WebsiteScraper,
     website_name: str,
+    pool: ContextPool | None = None,
 ) -> None:
     """Helper to run an individual scraper inside its own headless browser with retry logic."""
-    max_retries = config.browser_settings.max_retries
-
-    for attempt in range(max_retries):
-        user_agent = generate_random_user_agent()
-        try:
-            logger.debug(
-                f"[{website_name}] Attempt {attempt + 1}/{max_retries} to scrape with user agent: {user_agent[:30]}..."
-            )
-            await scraper_fn(playwright, user_agent)
-            logger.info(
-                f"[{website_name}] Successfully completed scraping attempt {attempt + 1}."
-            )
-            break
-        except ScraperAccessDenied as e:
-            logger.warning(
-                f"[{website_name}] Access denied on attempt {attempt + 1}/{max_retries}: {e}"
-            )
-            if attempt + 1 == max_retries:
-                logger.error(
-                    f"[{website_name}] Failed to scrape after {max_retries} attempts due to access denial."
-                )
-            else:
-                logger.info(f"[{website_name}] Retrying with a new user agent...")
-        except Exception as e:
-            logger.error(
-                f"[{website_name}] An unexpected error occurred on attempt {attempt + 1}/{max_retries}: {e}"
-            )
-            logger.error(traceback.format_exc())
-            if attempt + 1 == max_retries:
-                logger.error(
-                    f"[{website_name}] Failed to scrape after {max_retries} attempts due to unexpected errors."
-                )
-            else:
-                logger.info(
-                    f"[{website_name}] Retrying with a new user agent due to unexpected error..."
-                )
+    settings = get_config().browser_settings
+    user_agents = UserAgentRotator()
+
+    async def attempt() -> None:
+        # Every attempt, including retries after access denial, gets a new user agent
+        user_agent = user_agents.next()
+        logger.debug(
+            "[%s] Scraping with user agent: %.30s...", website_name, user_agent
+        )
+        async with _browser_sem():
+            await scraper_fn(playwright, user_agent, pool)
+
+    try:
+        await run_with_retries(
+            action=attempt,
+            max_retries=settings.max_retries - 1,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+            logger=logger,
+            action_name=f"scrape {website_name}",
+            fatal_exceptions=_FATAL_SCRAPER_ERRORS,
+        )
+    except ScraperAccessDenied as e:
+        logger.error("[%s] Failed to scrape due to access denial: %s", website_name, e)
+    except Exception as e:
+        logger.error("[%s] Failed to scrape: %s", website_name, e)
+        logger.debug("Call stack", exc_info=True)
+    else:
+        logger.info("[%s] Successfully completed scraping.", website_name)
 
 
 @click.command()
 def run_scraper() -> None:
+    configure_logging(log_level=get_config().LOGGING_LEVEL)
     asyncio.run(async_run_scraper())
@@ -0,0 +1,59 @@
+import subprocess
+from pathlib import Path
+
+import click
+from playwright.sync_api import sync_playwright
+
+from broker_agent.config.logging import configure_logging, get_logger
+from broker_agent.config.settings import get_config
+
+logger = get_logger(__name__)
+
+_DEFAULT_USER_DATA_DIR = Path.home() / ".cache" / "broker_agent" / "chromium"
+
+
+@click.command()
+@click.option(
+    "--port",
+    type=int,
+    default=9222,
+    show_default=True,
+    help="Remote debugging port to expose.",
+)
+@click.option(
+    "--user-data-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=_DEFAULT_USER_DATA_DIR,
+    show_default=True,
+    help="Profile directory, kept between runs so cookies and caches stay warm.",
+)
+def start_browser(port: int, user_data_dir: Path) -> None:
+    """Start a persistent Chromium in the background for scrapers to connect to.
+
+    Set ``cdp_endpoint`` in browser.yaml to the printed endpoint so that ``scrape``
+    reuses this browser instead of launching its own.
+    """
+    config = get_config()
+    configure_logging(log_level=config.LOGGING_LEVEL)
+    with sync_playwright() as playwright:
+        executable = playwright.chromium.executable_path
+
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+    args = [
+        executable,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir}",
+        *config.browser_settings.chrome_args,
+    ]
+    if config.HEADLESS_BROWSER:
+        args.append("--headless=new")
+
+    process = subprocess.Popen(
+        args,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    logger.info(
+        f"Started Chromium (pid {process.pid}), CDP endpoint: http://localhost:{port}"
+    )
@@ -0,0 +1,49 @@
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class _CircuitState:
+    failures: int = 0
+    opened_at: float = 0.0
+
+
+class CircuitBreaker:
+    """
+    Per-key circuit breaker, e.g. keyed by the host being scraped.
+
+    After ``failure_threshold`` consecutive failures for a key the circuit opens
+    and ``allow`` returns False, so callers can fail fast instead of hammering a
+    host that is blocking them. Once ``reset_timeout`` seconds have passed the
+    circuit is half-open: a single trial call is allowed through, and its outcome
+    either closes the circuit again or keeps it open for another timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._states: dict[Hashable, _CircuitState] = {}
+
+    def allow(self, key: Hashable) -> bool:
+        """Return whether a call for the key may go ahead."""
+        state = self._states.get(key)
+        if state is None or state.failures < self._failure_threshold:
+            return True
+        now = time.monotonic()
+        if now - state.opened_at >= self._reset_timeout:
+            # Half-open: let this call through and hold back the rest
+            state.opened_at = now
+            return True
+        return False
+
+    def record_success(self, key: Hashable) -> None:
+        """Close the circuit for the key."""
+        self._states.pop(key, None)
+
+    def record_failure(self, key: Hashable) -> None:
+        """Count a failure for the key, opening the circuit at the threshold."""
+        state = self._states.setdefault(key, _CircuitState())
+        state.failures += 1
+        if state.failures >= self._failure_threshold:
+            state.opened_at = time.monotonic()
@@ -1,7 +1,7 @@
-from enum import Enum
+from enum import StrEnum
 
 
-class ApartmentType(Enum):
+class ApartmentType(StrEnum):
     STUDIO = "Studio"
     ONE_BEDROOM = "1 Bedroom"
     TWO_BEDROOM = "2 Bedrooms"
@@ -9,7 +9,7 @@ class ApartmentType(Enum):
     FOUR_PLUS_BEDROOM = "4+ Bedrooms"
 
 
-class LLMType(Enum):
+class LLMType(StrEnum):
     OLLAMA = "ollama"
     OLLAMA_VLM = "ollama_vlm"
     OPENAI = "openai"
@@ -17,7 +17,7 @@ class LLMType(Enum):
     HUGGINGFACE = "huggingface"
 
 
-class WebsiteType(Enum):
+class WebsiteType(StrEnum):
     STREETEASY = "https://streeteasy.com/for-rent/nyc"
     APARTMENTS_DOT_COM = "https://www.apartments.com/new-york-ny/"
     RENTHOP = "https://renthop.com"
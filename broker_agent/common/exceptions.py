@@ -14,3 +14,9 @@ class ApartmentScrapingError(Exception):
     """Custom exception for apartment scraping errors."""
 
     pass
+
+
+class CircuitOpenError(Exception):
+    """Custom exception for calls short-circuited by an open circuit breaker."""
+
+    pass
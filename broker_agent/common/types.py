@@ -2,4 +2,6 @@ from collections.abc import Awaitable, Callable
 
 from playwright.async_api import Playwright
 
-WebsiteScraper = Callable[[Playwright, str, str], Awaitable[None]]
+from broker_agent.browser.context_pool import ContextPool
+
+WebsiteScraper = Callable[[Playwright, str, ContextPool | None], Awaitable[None]]
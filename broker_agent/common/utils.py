@@ -1,24 +1,61 @@
 import asyncio
+import math
 import random
 import re
 import uuid
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
 from datetime import datetime
+from functools import lru_cache
 from typing import TypeVar
+from weakref import WeakKeyDictionary
 
 from playwright.async_api import Locator, Page
-from sqlalchemy import select
+from sqlalchemy import ARRAY, Text, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from broker_agent.config.logging import get_logger
-from database.alembic.models.models import Apartment
-from storage.minio_client import connector
+from broker_agent.config.settings import get_config
+from database.alembic.models.models import Apartment, ApartmentTag, ApartmentTagMapping
+from storage.minio_client import get_connector
 
 logger = get_logger(__name__)
 
 T = TypeVar("T")
 
 
+_WS_RE = re.compile(r"\s+")
+# Separators between items when a features/amenities section is read as one string
+_TAG_SPLIT_RE = re.compile(r"[\n,;•]+")
+
+_EXTRA_CLICK_SELECTORS = (
+    "header",
+    "footer",
+    "body",
+    "nav",
+    ".searchBar",
+    ".site-logo",
+    ".site-header",
+    ".header-show-phone",
+)
+# Selectors found on each page, keyed by page and tagged with the URL they were found on
+_extra_click_cache: WeakKeyDictionary[Page, tuple[str, list[str]]] = WeakKeyDictionary()
+
+_PRICE_STRIP = str.maketrans("", "", "$,")
+_PRICE_RE = re.compile(r"\d+(?:\.\d+)?")
+
+# Numeric dates are the only ones containing a slash, so they get a single attempt
+_NUMERIC_DATE_FORMATS = ("%m/%d/%Y",)  # "08/19/2024"
+# Supported month-name formats, from most specific to least specific
+_MONTH_NAME_DATE_FORMATS = (
+    "%b %d, %Y",  # "Aug 19, 2024"
+    "%B %d, %Y",  # "August 19, 2024"
+    "%b %d",  # "Aug 19"
+    "%B %d",  # "August 19"
+)
+
+
 async def get_all_imgs_by_apt_id(
     apt_id: uuid.UUID, db_session: AsyncSession
 ) -> list[str]:
@@ -32,25 +69,107 @@ async def get_all_imgs_by_apt_id(
     Returns:
         list[str]: A list of image URLs.
     """
-    query = select(Apartment).where(Apartment.apartment_id == apt_id)
+    urls_by_apt_id = await get_all_imgs_by_apt_ids([apt_id], db_session)
+    return urls_by_apt_id.get(apt_id, [])
+
+
+async def get_all_imgs_by_apt_ids(
+    apt_ids: Iterable[uuid.UUID], db_session: AsyncSession
+) -> dict[uuid.UUID, list[str]]:
+    """
+    Get all images for several apartments in a single query.
+
+    Args:
+        apt_ids (Iterable[uuid.UUID]): The IDs of the apartments.
+        db_session (AsyncSession): Database session.
+
+    Returns:
+        dict[uuid.UUID, list[str]]: Image URLs keyed by apartment ID. Apartments
+        that do not exist are missing from the result.
+    """
+    apt_ids = list(apt_ids)
+    if not apt_ids:
+        return {}
+    query = select(Apartment.apartment_id, Apartment.image_urls).where(
+        Apartment.apartment_id.in_(apt_ids)
+    )
     result = await db_session.execute(query)
-    apartment = result.scalar_one_or_none()
+    return {apt_id: urls or [] for apt_id, urls in result.all()}
 
-    if not apartment:
-        return []
 
-    return apartment.image_urls
+async def prefetch_existing_links(
+    session: AsyncSession, listing_urls: list[str]
+) -> set[str]:
+    """
+    Returns the subset of the given listing links that already exist in the database,
+    using a single query instead of one round-trip per listing.
+
+    The links are sent as one array parameter (``link = ANY($1)``) rather than
+    an IN list with one parameter per link, so the statement text is the same for
+    any number of links and its prepared plan is reused.
+    """
+    if not listing_urls:
+        return set()
+    links = bindparam("links", list(listing_urls), type_=ARRAY(Text))
+    result = await session.scalars(
+        select(Apartment.link).where(Apartment.link == any_(links))
+    )
+    return set(result)
+
+
+def normalize_tag_names(texts: Iterable[str]) -> list[str]:
+    """
+    Splits scraped feature/amenity text into distinct tag names, collapsing
+    whitespace and keeping the order they were first seen in.
+    """
+    names = (
+        _WS_RE.sub(" ", part).strip()
+        for text in texts
+        if text
+        for part in _TAG_SPLIT_RE.split(text)
+    )
+    return list(dict.fromkeys(name for name in names if name))
 
 
-async def is_listing_duplicate(session: AsyncSession, listing_url: str) -> bool:
+async def save_apartment_tags(
+    session: AsyncSession, tags_by_apartment_id: dict[uuid.UUID, list[str]]
+) -> None:
     """
-    Checks if a listing with the given link already exists in the database.
+    Links apartments to their tags, creating any tag names not seen before.
+
+    New names are inserted with ``ON CONFLICT DO NOTHING`` so concurrent scrapers
+    can add the same tag, then every name is resolved to its ID with one query
+    and the mappings are inserted in a single batch.
     """
+    names = list(
+        dict.fromkeys(name for tags in tags_by_apartment_id.values() for name in tags)
+    )
+    if not names:
+        return
+    await session.execute(
+        pg_insert(ApartmentTag).on_conflict_do_nothing(index_elements=["name"]),
+        [{"apartment_tag_id": uuid.uuid4(), "name": name} for name in names],
+    )
     result = await session.execute(
-        select(Apartment).where(Apartment.link == listing_url)
+        select(ApartmentTag.name, ApartmentTag.apartment_tag_id).where(
+            ApartmentTag.name == any_(bindparam("names", names, type_=ARRAY(Text)))
+        )
+    )
+    tag_ids = dict(result.all())
+    await session.execute(
+        pg_insert(ApartmentTagMapping).on_conflict_do_nothing(
+            index_elements=["apartment_id", "apartment_tag_id"]
+        ),
+        [
+            {
+                "apartment_tag_mapping_id": uuid.uuid4(),
+                "apartment_id": apartment_id,
+                "apartment_tag_id": tag_ids[name],
+            }
+            for apartment_id, tags in tags_by_apartment_id.items()
+            for name in tags
+        ],
     )
-    exists = result.scalar_one_or_none() is not None
-    return exists
 
 
 def parse_availability_date(date_text: str) -> datetime:
@@ -58,31 +177,25 @@ def parse_availability_date(date_text: str) -> datetime:
     Parses a date string from a listing into a datetime object.
     Handles various formats like "now", "MM/DD/YYYY", and "Mon DD".
     """
+    now = datetime.now()
     if not date_text:
-        return datetime.now()
+        return now
 
     # Normalize whitespace and convert to lower case
-    cleaned_text = re.sub(r"\s+", " ", date_text).strip().lower()
+    cleaned_text = _WS_RE.sub(" ", date_text).strip().lower()
 
     if "now" in cleaned_text or not cleaned_text:
-        return datetime.now()
+        return now
 
     # Remove extra words that might interfere
     cleaned_text = cleaned_text.replace("availibility", "").strip()
 
-    # Supported date formats, from most specific to least specific
-    formats_to_try = [
-        "%m/%d/%Y",  # "08/19/2024"
-        "%b %d, %Y",  # "Aug 19, 2024"
-        "%B %d, %Y",  # "August 19, 2024"
-        "%b %d",  # "Aug 19"
-        "%B %d",  # "August 19"
-    ]
-
-    now = datetime.now()
+    formats_to_try = (
+        _NUMERIC_DATE_FORMATS if "/" in cleaned_text else _MONTH_NAME_DATE_FORMATS
+    )
 
     for fmt in formats_to_try:
-        try:
+        with suppress(ValueError):
             parsed_date = datetime.strptime(cleaned_text, fmt)
             # If year is not parsed, it defaults to 1900. Fix it.
             if parsed_date.year == 1900:
@@ -91,8 +204,6 @@ def parse_availability_date(date_text: str) -> datetime:
                 if parsed_date < now:
                     parsed_date = parsed_date.replace(year=now.year + 1)
             return parsed_date
-        except ValueError:
-            continue
 
     logger.warning(
         f"Could not parse availability date: '{date_text}', using current date."
@@ -107,16 +218,9 @@ def parse_price_as_float(price_text: str) -> float:
     """
     if not price_text:
         return 0.0
-    cleaned = price_text.replace("$", "").replace(",", "")
-    match = re.search(r"(\d+(?:\.\d+)?)", cleaned)
+    match = _PRICE_RE.search(price_text.translate(_PRICE_STRIP))
     if match:
-        try:
-            return float(match.group(1))
-        except Exception as e:
-            logger.warning(
-                f"parse_price_as_float: Could not convert '{match.group(1)}' to float: {e}"
-            )
-            return 0.0
+        return float(match.group())
     logger.warning(
         f"parse_price_as_float: No number found in price text: '{price_text}'"
     )
@@ -141,12 +245,41 @@ async def get_all_imgs_by_apt_id_as_base64(
             }
     """
     img_urls = await get_all_imgs_by_apt_id(apt_id, db_session)
+    return await fetch_imgs_as_base64(img_urls)
+
+
+async def fetch_imgs_as_base64(img_urls: list[str]) -> list[dict]:
+    """
+    Fetch images from MinIO as base64, a bounded number at a time.
+
+    Args:
+        img_urls (list[str]): MinIO URLs of the images.
+
+    Returns:
+        list[dict]: Same format as ``get_all_imgs_by_apt_id_as_base64``.
+    """
     if not img_urls:
         return []
 
+    config = get_config()
+    semaphore = asyncio.Semaphore(config.minio_parallel_fetches)
+
+    async def fetch(url: str) -> tuple[str | None, str | None]:
+        async with semaphore:
+            return await get_connector().get_object_as_base64(
+                url, png_to_jpeg=config.minio_png_to_jpeg
+            )
+
+    fetched = await asyncio.gather(
+        *(fetch(url) for url in img_urls), return_exceptions=True
+    )
+
     results = []
-    for url in img_urls:
-        base64_data, mime_type = await connector.get_object_as_base64(url)
+    for url, outcome in zip(img_urls, fetched, strict=True):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Failed to fetch image {url}: {outcome}")
+            continue
+        base64_data, mime_type = outcome
         results.append(
             {
                 "data": base64_data,
@@ -156,8 +289,61 @@ async def get_all_imgs_by_apt_id_as_base64(
     return results
 
 
+async def fetch_imgs_as_bytes(img_urls: list[str]) -> list[bytes]:
+    """
+    Fetch images from MinIO as raw bytes, a bounded number at a time.
+
+    Args:
+        img_urls (list[str]): MinIO URLs of the images.
+
+    Returns:
+        list[bytes]: The image data of every image that could be fetched.
+    """
+    if not img_urls:
+        return []
+
+    config = get_config()
+    semaphore = asyncio.Semaphore(config.minio_parallel_fetches)
+
+    async def fetch(url: str) -> bytes | None:
+        async with semaphore:
+            return await get_connector().get_object_bytes(
+                url, png_to_jpeg=config.minio_png_to_jpeg
+            )
+
+    fetched = await asyncio.gather(
+        *(fetch(url) for url in img_urls), return_exceptions=True
+    )
+
+    results = []
+    for url, outcome in zip(img_urls, fetched, strict=True):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Failed to fetch image {url}: {outcome}")
+            continue
+        if outcome is not None:
+            results.append(outcome)
+    return results
+
+
+@lru_cache(maxsize=64)
+def _human_delay_params(min_ms: int, max_ms: int) -> tuple[float, float, float, float]:
+    """
+    Log-normal parameters for a delay range, in seconds.
+
+    The median sits at the geometric mean of the bounds and the bounds lie two
+    standard deviations out in log space, so roughly 95% of samples fall inside
+    the range before clamping.
+    """
+    low, high = max(min_ms, 1) / 1000.0, max(max_ms, min_ms, 1) / 1000.0
+    mu = (math.log(low) + math.log(high)) / 2
+    sigma = (math.log(high) - math.log(low)) / 4
+    return mu, sigma, low, high
+
+
 async def random_human_delay(min_ms=200, max_ms=900):
-    await asyncio.sleep(random.uniform(min_ms, max_ms) / 1000.0)
+    # Human pauses are right-skewed, so sample log-normally rather than uniformly
+    mu, sigma, low, high = _human_delay_params(min_ms, max_ms)
+    await asyncio.sleep(min(max(random.lognormvariate(mu, sigma), low), high))
 
 
 async def get_text_content(locator: Locator, selector: str):
@@ -174,9 +360,10 @@ async def run_with_retries(
     max_delay: float,
     logger,
     action_name: str,
+    fatal_exceptions: tuple[type[BaseException], ...] = (),
 ) -> T:
     """
-    Runs an async action with exponential backoff retries.
+    Runs an async action with jittered exponential backoff retries.
     Args:
         action: The async function to run.
         max_retries: Maximum number of retries.
@@ -184,19 +371,25 @@ async def run_with_retries(
         max_delay: Maximum delay for backoff in seconds.
         logger: The logger to use for logging warnings.
         action_name: A descriptive name for the action being tried.
+        fatal_exceptions: Exception types that are re-raised immediately without retrying.
     Returns:
         The result of the action if successful.
     Raises:
-        Exception: If the action fails after all retries.
+        Exception: If the action fails after all retries, or with a fatal exception.
     """
     for retry in range(max_retries + 1):
         try:
             return await action()
+        except fatal_exceptions:
+            raise
         except Exception as e:
             if retry < max_retries:
-                delay = min(base_delay * (2**retry), max_delay)
+                # Jitter keeps parallel scrapers from retrying in lockstep
+                delay = min(base_delay * (2**retry), max_delay) * random.uniform(
+                    0.5, 1.5
+                )
                 logger.warning(
-                    f"Failed to {action_name} (attempt {retry+1}/{max_retries+1}). "
+                    f"Failed to {action_name} (attempt {retry + 1}/{max_retries + 1}). "
                     f"Retrying after {delay:.1f}s. Error: {e}"
                 )
                 await asyncio.sleep(delay)
@@ -207,24 +400,31 @@ async def run_with_retries(
                 raise e
 
 
+async def _present_extra_click_selectors(page: Page) -> list[str]:
+    """Return the extra-click selectors present on the page's current document."""
+    cached = _extra_click_cache.get(page)
+    if cached is not None and cached[0] == page.url:
+        return cached[1]
+    # Filter in the browser so the check costs one round-trip for all selectors
+    present = await page.evaluate(
+        "sels => sels.filter(s => document.querySelector(s) !== null)",
+        list(_EXTRA_CLICK_SELECTORS),
+    )
+    _extra_click_cache[page] = (page.url, present)
+    return present
+
+
 async def random_extra_click(page: Page):
     # Randomly click somewhere on the page (e.g., header, footer, or a random button)
     # to simulate human behavior. This is a no-op if selector not found.
-    selectors = [
-        "header",
-        "footer",
-        "body",
-        "nav",
-        ".searchBar",
-        ".site-logo",
-        ".site-header",
-        ".header-show-phone",
-    ]
-    selector = random.choice(selectors)
     try:
-        el = page.locator(selector).first
+        selectors = await _present_extra_click_selectors(page)
+        if not selectors:
+            return
+        # Present elements can still be hidden, so only visible ones are clicked
+        el = page.locator(random.choice(selectors)).first
         if await el.is_visible():
             await el.click(timeout=500, force=True)
             await random_human_delay(100, 400)
     except Exception:
-        pass  # Ignore if not clickable
+        pass  # Ignore if not clickable; the other cached selectors stay usable
@@ -7,7 +7,7 @@ import logging.config
 from pathlib import Path
 from typing import Any
 
-from broker_agent.config.settings import config as broker_agent_config
+from broker_agent.config.settings import get_config
 
 # Default log format
 DEFAULT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -16,6 +16,9 @@ DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 # Default log level
 DEFAULT_LOG_LEVEL = "INFO"
 
+# (log_level, log_file) of the configuration currently applied, if any
+_APPLIED: tuple[str | None, str | None] | None = None
+
 # Color mapping for different log levels
 LOG_COLORS = {
     "DEBUG": "\033[36m",  # Cyan
@@ -32,12 +35,17 @@ class ColoredFormatter(logging.Formatter):
     Custom formatter to add colors to log messages based on their level.
     """
 
+    # Colored level names are built once rather than on every record
+    _COLORED_LEVELNAMES = {
+        level: f"{color}{level}{LOG_COLORS['RESET']}"
+        for level, color in LOG_COLORS.items()
+        if level != "RESET"
+    }
+
     def format(self, record):
-        levelname = record.levelname
-        if levelname in LOG_COLORS:
-            record.levelname = (
-                f"{LOG_COLORS[levelname]}{levelname}{LOG_COLORS['RESET']}"
-            )
+        record.levelname = self._COLORED_LEVELNAMES.get(
+            record.levelname, record.levelname
+        )
         return super().format(record)
 
 
@@ -55,7 +63,7 @@ def get_log_config(
         Dict configuration for logging.config
     """
 
-    level = log_level.upper() if log_level else broker_agent_config.LOGGING_LEVEL
+    level = log_level.upper() if log_level else get_config().LOGGING_LEVEL
 
     handlers = ["console"]
     if log_file:
@@ -106,6 +114,11 @@ def get_log_config(
                 "level": "WARNING",
                 "propagate": False,
             },
+            "httpx": {
+                "handlers": handlers,
+                "level": "WARNING",
+                "propagate": False,
+            },
         },
     }
 
@@ -132,8 +145,17 @@ def configure_logging(
         log_level: Override for log level
         log_file: Optional path to log file
     """
+    global _APPLIED
+    key = (
+        log_level.upper() if log_level else None,
+        str(log_file) if log_file else None,
+    )
+    # dictConfig tears down and rebuilds every handler, so skip identical re-runs
+    if key == _APPLIED:
+        return
     config = get_log_config(log_level, log_file)
     logging.config.dictConfig(config)
+    _APPLIED = key
 
 
 def get_logger(name: str) -> logging.Logger:
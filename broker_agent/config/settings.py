@@ -1,4 +1,7 @@
+import copy
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 import yaml
 from pydantic import BaseModel, Field, field_validator
@@ -6,6 +9,28 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 ROOT_DIR = Path(__file__).parent.parent.parent
 
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file; the mtime and size arguments only key the cache."""
+    return yaml.load(Path(path).read_text(encoding="utf-8"), Loader=_YAML_LOADER)
+
+
+def _load_yaml(file_path: Path) -> Any:
+    """
+    Load a YAML file, re-parsing it only when its modification time or size change.
+
+    A deep copy is returned so callers can never mutate the cached document.
+    Raises FileNotFoundError if the file does not exist.
+    """
+    stat = file_path.stat()
+    return copy.deepcopy(
+        _load_yaml_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+    )
+
 
 class BrowserSettings(BaseModel):
     """
@@ -21,6 +46,16 @@ class BrowserSettings(BaseModel):
         timezones (list[str]): List of timezone strings for randomization (e.g., "America/New_York").
         chrome_args (list[str]): List of additional Chrome launch arguments.
         blocked_url_patterns (list[str]): List of URL patterns to block.
+        block_resources (bool): Whether to abort requests for the resource types in block_resource_types.
+        block_resource_types (list[str]): Playwright resource types to block (e.g., "image", "font").
+        context_pool_size (int | None): Maximum number of pooled browser contexts (defaults to 1 + listing_concurrency per scraper task).
+        context_max_uses (int): Number of uses after which a pooled context is replaced.
+        context_max_idle_time (float): Seconds after which an idle pooled context is closed.
+        max_concurrent (int | None): Maximum number of scrapers driving a browser at once (defaults to the CPU count, capped at the number of scraper tasks).
+        listing_concurrency (int): Number of listing detail pages scraped at once by a single scraper.
+        retry_base_delay (float): Base delay in seconds before retrying a failed scraper run.
+        retry_max_delay (float): Maximum delay in seconds between scraper retries.
+        cdp_endpoint (str | None): CDP endpoint of a persistent Chromium to connect to instead of launching one (e.g., "http://localhost:9222").
     """
 
     viewport_sizes: list[dict[str, int]] = Field(
@@ -32,10 +67,42 @@ class BrowserSettings(BaseModel):
     max_retries: int = Field(
         default=3, description="Maximum number of retries for scraping"
     )
+    retry_base_delay: float = Field(
+        default=2.0, description="Base delay in seconds between scraper retries"
+    )
+    retry_max_delay: float = Field(
+        default=60.0, description="Maximum delay in seconds between scraper retries"
+    )
     chrome_args: list[str] = Field(default=[], description="Chrome launch arguments")
     blocked_url_patterns: list[str] = Field(
         default=[], description="List of URL patterns to block"
     )
+    block_resources: bool = Field(
+        default=True, description="Whether to block the configured resource types"
+    )
+    block_resource_types: list[str] = Field(
+        default=["image"], description="Playwright resource types to block"
+    )
+    context_pool_size: int | None = Field(
+        default=None, description="Maximum number of pooled browser contexts"
+    )
+    context_max_uses: int = Field(
+        default=20, description="Uses after which a pooled browser context is replaced"
+    )
+    context_max_idle_time: float = Field(
+        default=300.0,
+        description="Seconds after which an idle pooled context is closed",
+    )
+    max_concurrent: int | None = Field(
+        default=None, description="Maximum number of scrapers driving a browser at once"
+    )
+    listing_concurrency: int = Field(
+        default=4, description="Number of listing detail pages scraped at once"
+    )
+    cdp_endpoint: str | None = Field(
+        default=None,
+        description="CDP endpoint of a persistent Chromium to connect to",
+    )
 
     @classmethod
     def from_yaml(cls, file_path: Path | None = None) -> "BrowserSettings":
@@ -55,12 +122,11 @@ class BrowserSettings(BaseModel):
         if file_path is None:
             file_path = Path(__file__).parent / "browser.yaml"
 
-        if not file_path.exists():
+        try:
+            browser_config = _load_yaml(file_path)
+        except FileNotFoundError:
             return cls()
 
-        with open(file_path) as f:
-            browser_config = yaml.safe_load(f)
-
         return cls(**browser_config) if browser_config else cls()
 
 
@@ -93,12 +159,11 @@ class ImageAnalysisConfig(BaseModel):
         if file_path is None:
             file_path = Path(__file__).parent / "image_analysis.yaml"
 
-        if not file_path.exists():
+        try:
+            image_analysis_config = _load_yaml(file_path)
+        except FileNotFoundError:
             return cls()
 
-        with open(file_path) as f:
-            image_analysis_config = yaml.safe_load(f)
-
         return cls(**image_analysis_config) if image_analysis_config else cls()
 
 
@@ -168,6 +233,30 @@ class BrokerAgentConfig(BaseSettings):
     )
 
     minio_bucket: str = Field(default="broker_agent", description="MinIO bucket name")
+    minio_parallel_fetches: int = Field(
+        default=16,
+        description="Maximum number of concurrent MinIO object fetches per apartment",
+    )
+    minio_png_to_jpeg: bool = Field(
+        default=False,
+        description="Re-encode large PNG images as JPEG when fetching them for the vision LLM (requires the vision extra)",
+    )
+    minio_jpeg_quality: int = Field(
+        default=85,
+        description="JPEG quality used when re-encoding PNG images",
+    )
+    minio_base64_cache_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Memory budget in bytes for base64 encoded MinIO objects kept for reuse (0 disables)",
+    )
+    minio_max_image_bytes: int = Field(
+        default=20 * 1024 * 1024,
+        description="Images larger than this many bytes are not downloaded to MinIO",
+    )
+    minio_part_size: int = Field(
+        default=64 * 1024 * 1024,
+        description="Multipart part size in bytes for MinIO uploads of known length",
+    )
 
     websites: list[str] = Field(
         default_factory=list,
@@ -210,6 +299,16 @@ class BrokerAgentConfig(BaseSettings):
         description="Maximum number of retries when StreetEasy pagination navigation fails",
     )
 
+    # Scraped listings are queued and written to the database in batches
+    listing_insert_max_rows: int = Field(
+        default=50,
+        description="Maximum number of scraped listings written to the database in one batch",
+    )
+    listing_insert_wait_time: float = Field(
+        default=5.0,
+        description="Seconds to wait for a listing batch to fill before writing it anyway",
+    )
+
     parallel_browsers: int = Field(
         default=3,
         description="Number of parallel browser instances to use per website when scraping",
@@ -229,6 +328,17 @@ class BrokerAgentConfig(BaseSettings):
     POSTGRES_HOST: str = Field(default="localhost", description="PostgreSQL host")
     POSTGRES_PORT: int = Field(default=5432, description="PostgreSQL port")
     POSTGRES_DB: str = Field(default="postgres", description="PostgreSQL database name")
+    POSTGRES_POOL_SIZE: int = Field(
+        default=20, description="Number of pooled async PostgreSQL connections"
+    )
+    POSTGRES_MAX_OVERFLOW: int = Field(
+        default=10,
+        description="Extra async PostgreSQL connections allowed beyond the pool size",
+    )
+    POSTGRES_STATEMENT_CACHE_SIZE: int = Field(
+        default=512,
+        description="Prepared statements cached per connection (set to 0 behind PgBouncer in transaction mode)",
+    )
 
     # MinIO configuration
     MINIO_ENDPOINT: str = Field(
@@ -236,6 +346,7 @@ class BrokerAgentConfig(BaseSettings):
     )
     MINIO_ROOT_USER: str = Field(default="minioadmin", description="MinIO user name")
     MINIO_ROOT_PASSWORD: str = Field(default="", description="MinIO secret password")
+    MINIO_SECURE: bool = Field(default=False, description="Connect to MinIO over HTTPS")
 
     # Browser config
     browser_settings: BrowserSettings = Field(
@@ -287,8 +398,7 @@ class BrokerAgentConfig(BaseSettings):
         config = cls()
 
         config_dir = Path(__file__).parent
-        with open(config_dir / "default.yaml") as f:
-            yaml_config = yaml.safe_load(f)
+        yaml_config = _load_yaml(config_dir / "default.yaml")
 
         config = cls._load_from_yaml(config, yaml_config)
         return config
@@ -298,6 +408,10 @@ class BrokerAgentConfig(BaseSettings):
         """
         Helper function to load config values from yaml file.
 
+        YAML values override those already on ``config`` and the merged result is
+        validated in a single pass, so invalid YAML values raise instead of being
+        silently ignored.
+
         Args:
             config: The config instance to update
             yaml_config: The loaded yaml configuration
@@ -305,17 +419,34 @@ class BrokerAgentConfig(BaseSettings):
         Returns:
             Updated config instance
         """
-        if yaml_config:
-            for field_name, _ in config.__dict__.items():
-                # Skip private attributes and methods
-                if not field_name.startswith("_"):
-                    try:
-                        if field_name in yaml_config:
-                            setattr(config, field_name, yaml_config[field_name])
-                    except Exception:
-                        # If loading fails, keep the default value
-                        pass
-        return config
+        if not yaml_config:
+            return config
+        return cls.model_validate(
+            {
+                **config.model_dump(),
+                **{
+                    name: yaml_config[name]
+                    for name in cls.model_fields
+                    if name in yaml_config
+                },
+            }
+        )
+
+
+_config: BrokerAgentConfig | None = None
+
+
+def get_config() -> BrokerAgentConfig:
+    """Return the process-wide configuration, loading it on first use."""
+    global _config
+    if _config is None:
+        _config = BrokerAgentConfig.from_yaml_and_env()
+    return _config
 
 
-config = BrokerAgentConfig.from_yaml_and_env()
+def __getattr__(name: str) -> Any:
+    # Keeps `from broker_agent.config.settings import config` working while
+    # deferring the .env/YAML load and validation until the name is first needed
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
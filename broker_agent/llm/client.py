@@ -1,17 +1,50 @@
-from langchain.schema.language_model import BaseLanguageModel
-from langchain_ollama import ChatOllama
-from ollama import AsyncClient
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from broker_agent.common.enum import LLMType
-from broker_agent.config.settings import config
+from broker_agent.config.settings import get_config
+
+if TYPE_CHECKING:
+    from langchain.schema.language_model import BaseLanguageModel
+    from ollama import AsyncClient
+
+
+def _build_ollama(model: str) -> "BaseLanguageModel":
+    from langchain_ollama import ChatOllama
+
+    return ChatOllama(base_url=get_config().OLLAMA_BASE_URL, model=model)
+
+
+def _build_ollama_vlm(model: str) -> "AsyncClient":
+    # The model is chosen per request on the raw client, not at construction
+    from ollama import AsyncClient
+
+    return AsyncClient(host=get_config().OLLAMA_BASE_URL)
+
+
+# TODO: Implement other LLM types
+# LLMType.OPENAI: ChatOpenAI(model=model)
+# LLMType.ANTHROPIC: ChatAnthropic(model=model)
+# LLMType.HUGGINGFACE: HuggingFaceEndpoint(endpoint_url=config.HF_ENDPOINT_URL, model=model)
+_BUILDERS: dict[LLMType, Callable[[str], "BaseLanguageModel | AsyncClient"]] = {
+    LLMType.OLLAMA: _build_ollama,
+    LLMType.OLLAMA_VLM: _build_ollama_vlm,
+}
 
 
 def get_llm(
     model_name: str | None = None, llm_type: LLMType | str | None = None
-) -> BaseLanguageModel | AsyncClient:
+) -> "BaseLanguageModel | AsyncClient":
     """
     Get the language model client based on configuration or specified model.
 
+    Clients are cached per arguments, and the LLM libraries are only imported
+    once a client of their type is first requested. Ollama vision clients hold
+    an HTTP pool tied to the event loop that first uses it, so they are built
+    fresh on every call instead; ``ollama_vision_client`` also closes them.
+
     Args:
         model_name: Optional model name to override the default from config
         llm_type: Optional LLM type to use, defaults to config.llm_type
@@ -19,31 +52,42 @@ def get_llm(
     Returns:
         A language model instance
     """
+    config = get_config()
     model = model_name or config.llm
+    # LLMType is a StrEnum, so plain strings look up the same builders
+    key = llm_type or getattr(config, "llm_type", LLMType.OLLAMA)
+    if key == LLMType.OLLAMA_VLM:
+        return _build_ollama_vlm(model)
+    return _cached_llm(model, key)
 
-    # Convert string to enum if needed
-    if isinstance(llm_type, str):
-        llm_type = LLMType(llm_type)
 
-    # Use config default if not specified
-    llm_type = llm_type or getattr(config, "llm_type", LLMType.OLLAMA)
+@lru_cache(maxsize=8)
+def _cached_llm(model: str, key: LLMType | str) -> "BaseLanguageModel":
+    try:
+        builder = _BUILDERS[key]
+    except KeyError:
+        raise ValueError(f"Unsupported LLM type: {key}") from None
+    return builder(model)
 
-    # Create the appropriate LLM client based on type
-    if llm_type == LLMType.OLLAMA:
-        return ChatOllama(base_url=config.OLLAMA_BASE_URL, model=model)
-    elif llm_type == LLMType.OLLAMA_VLM:
-        return AsyncClient(host=config.OLLAMA_BASE_URL)
 
-    # TODO: Implement other LLM types
-    # elif llm_type == LLMType.OPENAI:
-    #     return ChatOpenAI(model=model)
-    # elif llm_type == LLMType.ANTHROPIC:
-    #     return ChatAnthropic(model=model)
-    # elif llm_type == LLMType.HUGGINGFACE:
-    #     return HuggingFaceEndpoint(endpoint_url=config.HF_ENDPOINT_URL, model=model)
-    else:
-        raise ValueError(f"Unsupported LLM type: {llm_type}")
+@asynccontextmanager
+async def ollama_vision_client() -> AsyncIterator["AsyncClient"]:
+    """
+    Open an Ollama vision client in the running event loop and close it on exit.
+
+    Share one client across the requests of a run, so they reuse its connections.
+    """
+    client = _build_ollama_vlm(get_config().vision_llm)
+    try:
+        yield client
+    finally:
+        # ollama's AsyncClient has no close method of its own
+        await client._client.aclose()
 
 
-# Default LLM instance for backward compatibility
-ollama = get_llm()
+def __getattr__(name: str):
+    # Default LLM instance for backward compatibility, built on first access
+    if name == "ollama":
+        globals()["ollama"] = get_llm()
+        return globals()["ollama"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
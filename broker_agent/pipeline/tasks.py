@@ -1,24 +1,20 @@
+import asyncio
 import random
 
-from playwright.async_api import Page, Playwright
+from playwright.async_api import Playwright
 
-from broker_agent.browser.scraping_browser import ScrapingBrowser
+from broker_agent.browser.context_pool import ContextPool
 from broker_agent.browser.scripts.apartments_dot_com import (
-    get_apartments_dot_com_listings,
+    get_apartments_dot_com_page_listings,
     process_apartments_dot_com_listings,
 )
-from broker_agent.browser.scripts.apartments_dot_com.utils import (
-    advance_to_apartments_dot_com_start_page,
-)
 from broker_agent.browser.scripts.streeteasy.streeteasy import (
     get_streeteasy_listings,
     process_streeteasy_listings,
 )
-from broker_agent.common.enum import WebsiteType
 from broker_agent.common.exceptions import ScraperAccessDenied
-from broker_agent.common.utils import random_human_delay, run_with_retries
 from broker_agent.config.logging import get_logger
-from broker_agent.config.settings import config as broker_agent_config
+from broker_agent.config.settings import get_config
 
 logger = get_logger(__name__)
 
@@ -31,131 +27,103 @@ logger = get_logger(__name__)
 async def scrape_streeteasy(
     playwright: Playwright,
     user_agent: str,
+    pool: ContextPool | None = None,
 ) -> None:
     """
-    StreetEasy listings are building-based.
+    StreetEasy listings are building-based. Search results are streamed page by
+    page into detail scraping rather than collected up front.
     """
-    listing_urls = await get_streeteasy_listings(playwright, user_agent)
-
-    if not listing_urls:
-        logger.info("No listings found by [Search]. Skipping detail processing.")
-        return
-
-    random.shuffle(listing_urls)
-
     processed_count = await process_streeteasy_listings(
-        playwright, user_agent, listing_urls
+        playwright,
+        user_agent,
+        get_streeteasy_listings(playwright, user_agent, pool),
+        pool,
     )
 
     logger.info(
-        f"Finished processing for StreetEasy. Processed {processed_count}/{len(listing_urls)} listings in detail."
+        f"Finished processing for StreetEasy. Processed {processed_count} listings in detail."
     )
 
 
 async def scrape_apartments_dot_com(
     playwright: Playwright,
     user_agent: str,
+    pool: ContextPool | None = None,
 ) -> None:
     """
     Apartments.com listings are building-based. This function orchestrates the scraping
-    process by iterating through search result pages, extracting listing URLs from each
-    page, and then processing those listings.
+    process by opening every search results page from apartments_dot_com_start_page
+    up to apartments_dot_com_max_pages concurrently, each directly by its page URL,
+    and then processing the union of the listing URLs found.
 
-    Implements exponential backoff for retrying pagination navigation, using
+    Implements exponential backoff for retrying search page loads, using
     apartments_dot_com_max_retries, apartments_dot_com_base_delay, and apartments_dot_com_max_delay.
     """
-    total_processed_count = 0
-    total_urls_found = 0
-
     # Get exponential backoff config from settings, with defaults if not present
+    broker_agent_config = get_config()
     max_retries = getattr(broker_agent_config, "apartments_dot_com_max_retries", 3)
     base_delay = getattr(broker_agent_config, "apartments_dot_com_base_delay", 2.0)
     max_delay = getattr(broker_agent_config, "apartments_dot_com_max_delay", 60.0)
     max_pages = getattr(broker_agent_config, "apartments_dot_com_max_pages", 10)
     start_page = getattr(broker_agent_config, "apartments_dot_com_start_page", 0)
 
-    async with ScrapingBrowser(playwright, user_agent, scrape_images=False) as page:
-        logger.info(f"Navigating to {WebsiteType.APARTMENTS_DOT_COM.value}")
-        await page.goto(
-            WebsiteType.APARTMENTS_DOT_COM.value,
-            wait_until="domcontentloaded",
-            timeout=60000,
-        )
-
-        await random_human_delay()
-
-        title = await page.title()
-        if "denied" in title.lower() or "robot" in title.lower():
-            raise ScraperAccessDenied("Access denied to Apartments.com for [Search].")
+    # start_page is the number of pages to skip; page numbers are 1-based
+    page_numbers = range(start_page + 1, max_pages + 1)
+    semaphore = asyncio.Semaphore(
+        broker_agent_config.browser_settings.listing_concurrency
+    )
 
-        page_count = await advance_to_apartments_dot_com_start_page(
-            page, start_page, max_retries, base_delay, max_delay
-        )
+    async def fetch_page(page_number: int) -> list[str]:
+        async with semaphore:
+            return await get_apartments_dot_com_page_listings(
+                playwright,
+                user_agent,
+                page_number,
+                max_retries,
+                base_delay,
+                max_delay,
+                pool,
+            )
 
-        if page_count < start_page + 1:
-            logger.info(f"Could not reach start page {start_page+1}. Stopping scrape.")
-            return
+    page_results = await asyncio.gather(
+        *(fetch_page(page_number) for page_number in page_numbers),
+        return_exceptions=True,
+    )
 
-        while page_count <= max_pages:
-            logger.info(f"Processing page {page_count}...")
-            listing_urls = await get_apartments_dot_com_listings(page)
+    listing_urls: list[str] = []
+    pages_scraped = 0
+    for page_number, result in zip(page_numbers, page_results, strict=True):
+        if isinstance(result, ScraperAccessDenied):
+            raise result
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to scrape page {page_number}: {result}")
+            continue
+        pages_scraped += 1
+        listing_urls.extend(result)
+    # Listings can move between pages while they are being fetched
+    listing_urls = list(dict.fromkeys(listing_urls))
 
-            if not listing_urls:
-                logger.info("No listings found on this page. Ending scrape.")
-                break
+    if not listing_urls:
+        logger.info("No listings found on any page. Skipping detail processing.")
+        return
 
-            total_urls_found += len(listing_urls)
-            random.shuffle(listing_urls)
+    random.shuffle(listing_urls)
 
-            processed_count = await process_apartments_dot_com_listings(
-                playwright, user_agent, listing_urls
-            )
-            total_processed_count += processed_count
-
-            async def navigate_next_page() -> str:
-                next_button_selector = "#paging .next"
-                next_button = page.locator(next_button_selector).first
-                if not await next_button.is_visible():
-                    logger.info("No next page button found. Finished scraping.")
-                    return "DONE"
-
-                logger.info("Navigating to the next page.")
-                await page.goto(
-                    WebsiteType.APARTMENTS_DOT_COM.value,
-                    wait_until="domcontentloaded",
-                    timeout=60000,
-                )
-                await random_human_delay()
-                await next_button.click()
-                await random_human_delay(1500, 3500)
-                return "OK"
-
-            try:
-                result = await run_with_retries(
-                    action=navigate_next_page,
-                    max_retries=max_retries,
-                    base_delay=base_delay,
-                    max_delay=max_delay,
-                    logger=logger,
-                    action_name="navigate to next page",
-                )
-                if result == "OK":
-                    page_count += 1
-                elif result == "DONE":
-                    break
-            except Exception:
-                logger.error(
-                    "Exceeded max retries for next page navigation. Stopping scrape."
-                )
-                break
+    processed_count = await process_apartments_dot_com_listings(
+        playwright, user_agent, listing_urls, pool
+    )
 
     logger.info(
         f"Finished processing for Apartments.com. "
-        f"Processed {total_processed_count}/{total_urls_found} listings in detail across {page_count - 1} page(s)."
+        f"Processed {processed_count}/{len(listing_urls)} listings in detail across {pages_scraped} page(s)."
     )
 
 
-async def scrape_renthop(page: Page, error_message: str | None = None) -> None:
+async def scrape_renthop(
+    playwright: Playwright,
+    user_agent: str,
+    pool: ContextPool | None = None,
+) -> None:
     """
     Renthop listings are building-based.
     """
@@ -1,7 +1,17 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import ARRAY, Column, DateTime, Float, ForeignKey, Integer, Text
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase
 
@@ -16,6 +26,8 @@ class Apartment(Base):
     """
 
     __tablename__ = "apartments"
+    # Every default is client-side, so never fetch generated values back after INSERT
+    __mapper_args__ = {"eager_defaults": False}
 
     apartment_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     date_scraped = Column(DateTime, nullable=False, default=datetime.now)
@@ -26,9 +38,6 @@ class Apartment(Base):
     days_on_market = Column(Integer, nullable=False)
     link = Column(Text, nullable=False, unique=True)
     image_urls = Column(ARRAY(Text), nullable=False)
-    policies = Column(Text, nullable=True)
-    home_features = Column(Text, nullable=True)
-    ammenities = Column(Text, nullable=True)
     similar_listings = Column(ARRAY(Text), nullable=True)
     ai_summary = Column(Text, nullable=True)
     sqft = Column(Integer, nullable=True)
@@ -43,6 +52,7 @@ class PriceHistory(Base):
     """
 
     __tablename__ = "price_history"
+    __mapper_args__ = {"eager_defaults": False}
 
     price_history_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     apartment_id = Column(
@@ -51,13 +61,17 @@ class PriceHistory(Base):
     price = Column(Float, nullable=False)
     date = Column(DateTime, nullable=False)
 
+    __table_args__ = (Index("ix_price_history_apt_date", apartment_id, date.desc()),)
+
 
 class ApartmentTag(Base):
     """
-    Enum table for possible tags assigned to apartments.
+    Enum table for possible tags assigned to apartments, e.g. the amenities,
+    home features and policies listed on a listing page.
     """
 
     __tablename__ = "apartment_tags"
+    __mapper_args__ = {"eager_defaults": False}
 
     apartment_tag_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, nullable=False, unique=True)
@@ -69,6 +83,7 @@ class ApartmentTagMapping(Base):
     """
 
     __tablename__ = "apartment_tag_mappings"
+    __mapper_args__ = {"eager_defaults": False}
 
     apartment_tag_mapping_id = Column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -81,3 +96,10 @@ class ApartmentTagMapping(Base):
         ForeignKey("apartment_tags.apartment_tag_id"),
         nullable=False,
     )
+
+    __table_args__ = (
+        UniqueConstraint(
+            apartment_id, apartment_tag_id, name="uq_apartment_tag_mappings_apt_tag"
+        ),
+        Index("ix_apartment_tag_mappings_tag", apartment_tag_id),
+    )
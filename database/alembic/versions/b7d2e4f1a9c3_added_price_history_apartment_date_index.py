@@ -0,0 +1,39 @@
+"""added_price_history_apartment_date_index
+
+Revision ID: b7d2e4f1a9c3
+Revises: 45eb195b5d02
+Create Date: 2026-10-16 09:12:41.538204
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f1a9c3'
+down_revision: str | None = '45eb195b5d02'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside a transaction, but avoids locking writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_price_history_apt_date',
+            'price_history',
+            ['apartment_id', sa.text('date DESC')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_price_history_apt_date',
+            table_name='price_history',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,90 @@
+"""normalized_listing_text_into_apartment_tags
+
+Revision ID: c3e8a5d2f7b1
+Revises: b7d2e4f1a9c3
+Create Date: 2026-10-16 10:41:07.215830
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a5d2f7b1'
+down_revision: str | None = 'b7d2e4f1a9c3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# One row per (apartment, tag name), split the same way the scraper splits tags
+_SPLIT_TAGS = r"""
+    SELECT DISTINCT a.apartment_id,
+           regexp_replace(btrim(part), '\s+', ' ', 'g') AS name
+    FROM apartments a,
+         LATERAL regexp_split_to_table(
+             concat_ws(E'\n', a.policies, a.home_features, a.ammenities),
+             E'[\\n,;•]+'
+         ) AS part
+    WHERE btrim(part) <> ''
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Mappings were never deduplicated, so drop repeats before making them unique
+    op.execute(
+        """
+        DELETE FROM apartment_tag_mappings m
+        USING apartment_tag_mappings d
+        WHERE m.apartment_id = d.apartment_id
+          AND m.apartment_tag_id = d.apartment_tag_id
+          AND m.ctid > d.ctid
+        """
+    )
+    op.create_unique_constraint(
+        'uq_apartment_tag_mappings_apt_tag',
+        'apartment_tag_mappings',
+        ['apartment_id', 'apartment_tag_id'],
+    )
+    op.create_index(
+        'ix_apartment_tag_mappings_tag',
+        'apartment_tag_mappings',
+        ['apartment_tag_id'],
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO apartment_tags (apartment_tag_id, name)
+        SELECT gen_random_uuid(), name
+        FROM (SELECT DISTINCT name FROM ({_SPLIT_TAGS}) s) t
+        ON CONFLICT (name) DO NOTHING
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO apartment_tag_mappings
+            (apartment_tag_mapping_id, apartment_id, apartment_tag_id)
+        SELECT gen_random_uuid(), s.apartment_id, t.apartment_tag_id
+        FROM ({_SPLIT_TAGS}) s
+        JOIN apartment_tags t ON t.name = s.name
+        ON CONFLICT (apartment_id, apartment_tag_id) DO NOTHING
+        """
+    )
+
+    op.drop_column('apartments', 'policies')
+    op.drop_column('apartments', 'home_features')
+    op.drop_column('apartments', 'ammenities')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Tags don't record which section they came from, so the text is not restored
+    op.add_column('apartments', sa.Column('ammenities', sa.Text(), nullable=True))
+    op.add_column('apartments', sa.Column('home_features', sa.Text(), nullable=True))
+    op.add_column('apartments', sa.Column('policies', sa.Text(), nullable=True))
+    op.drop_index(
+        'ix_apartment_tag_mappings_tag', table_name='apartment_tag_mappings'
+    )
+    op.drop_constraint(
+        'uq_apartment_tag_mappings_apt_tag', 'apartment_tag_mappings', type_='unique'
+    )
@@ -1,11 +1,21 @@
-from collections.abc import AsyncGenerator, Generator
+import uuid
+from collections.abc import AsyncGenerator, Callable, Generator
 from contextlib import asynccontextmanager, contextmanager
-
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from datetime import datetime
+from functools import cache
+from typing import Any
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
-from broker_agent.config.settings import config
+from broker_agent.config.settings import get_config
+from database.alembic.models.models import Apartment
 
 
 # Create SQLAlchemy engine with PostgreSQL connection from config
@@ -19,22 +29,69 @@ def get_database_url(async_mode: bool = False) -> str:
     Returns:
         str: Formatted database URL
     """
+    config = get_config()
     prefix = "postgresql+asyncpg" if async_mode else "postgresql"
     return f"{prefix}://{config.POSTGRES_USER}:{config.POSTGRES_PASSWORD}@{config.POSTGRES_HOST}:{config.POSTGRES_PORT}/{config.POSTGRES_DB}"
 
 
-# Create the engine with the configured URL
-engine = create_engine(get_database_url())
-async_engine = create_async_engine(get_database_url(async_mode=True))
+# Engines and session factories are built on first use, not at import, so
+# importing this module does not load the settings
+@cache
+def get_engine() -> Engine:
+    """Return the shared engine, creating it with the configured URL on first use."""
+    return create_engine(get_database_url())
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    """Return the shared async engine, creating it on first use."""
+    config = get_config()
+    return create_async_engine(
+        get_database_url(async_mode=True),
+        # Sized for parallel scrapers and the batching writers committing at once
+        pool_size=config.POSTGRES_POOL_SIZE,
+        max_overflow=config.POSTGRES_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        connect_args={
+            # asyncpg's statement cache and SQLAlchemy's adapter cache on top of it
+            "statement_cache_size": config.POSTGRES_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": config.POSTGRES_STATEMENT_CACHE_SIZE,
+        },
+    )
+
+
+@cache
+def _session_local() -> sessionmaker[Session]:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+
+@cache
+def _async_session_local() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        autocommit=False, autoflush=False, bind=get_async_engine()
+    )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-AsyncSessionLocal = async_sessionmaker(
-    autocommit=False, autoflush=False, bind=async_engine
-)
 
 # Create a thread-local scoped session
-ScopedSession = scoped_session(SessionLocal)
+@cache
+def _scoped_session() -> scoped_session[Session]:
+    return scoped_session(_session_local())
+
+
+_LAZY_ATTRIBUTES: dict[str, Callable[[], Any]] = {
+    "engine": get_engine,
+    "async_engine": get_async_engine,
+    "SessionLocal": _session_local,
+    "AsyncSessionLocal": _async_session_local,
+    "ScopedSession": _scoped_session,
+}
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps the module-level engine and session factory names importable
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -45,7 +102,7 @@ def get_db() -> Generator[Session, None, None]:
     Yields:
         Session: Database session
     """
-    db = SessionLocal()
+    db = _session_local()()
     try:
         yield db
     finally:
@@ -60,7 +117,7 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         AsyncSession: Async database session
     """
-    db = AsyncSessionLocal()
+    db = _async_session_local()()
     try:
         yield db
     finally:
@@ -76,7 +133,7 @@ def db_session() -> Generator[Session, None, None]:
     Yields:
         Session: Database session
     """
-    session = SessionLocal()
+    session = _session_local()()
     try:
         yield session
         session.commit()
@@ -96,7 +153,7 @@ async def async_db_session() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         AsyncSession: Async database session
     """
-    session = AsyncSessionLocal()
+    session = _async_session_local()()
     try:
         yield session
         await session.commit()
@@ -115,7 +172,7 @@ def get_scoped_session() -> Session:
     Returns:
         Session: Scoped database session
     """
-    return ScopedSession()
+    return _scoped_session()()
 
 
 def remove_scoped_session() -> None:
@@ -123,4 +180,50 @@ def remove_scoped_session() -> None:
     Removes the current thread-local session.
     Should be called when the work with the session is done.
     """
-    ScopedSession.remove()
+    _scoped_session().remove()
+
+
+async def bulk_copy_apartments(
+    session: AsyncSession, rows: list[dict[str, Any]]
+) -> list[tuple[uuid.UUID, str]]:
+    """
+    Bulk load apartment rows with PostgreSQL COPY over the session's asyncpg connection.
+
+    COPY skips the per-row parsing and planning of INSERT, but has no ON CONFLICT
+    clause, so a duplicate link fails the whole load. Callers should run this in a
+    savepoint and fall back to a regular INSERT if it raises. ``apartment_id`` and
+    ``date_scraped`` are generated for rows missing them, since COPY does not
+    apply the model's Python-side defaults.
+
+    Args:
+        session: Async database session, whose current transaction is used
+        rows: Apartment column values keyed by column name
+
+    Returns:
+        list[tuple[uuid.UUID, str]]: (apartment_id, link) of every copied row
+    """
+    if not rows:
+        return []
+
+    now = datetime.now()
+    columns = list(dict.fromkeys(["apartment_id", "date_scraped", *rows[0]]))
+    # Lay the batch out one list per column, so each column is read out of the
+    # row dicts once and the records are built with a single zip
+    values = {column: [row.get(column) for row in rows] for column in columns}
+    values["apartment_id"] = [
+        apartment_id or uuid.uuid4() for apartment_id in values["apartment_id"]
+    ]
+    values["date_scraped"] = [
+        date_scraped or now for date_scraped in values["date_scraped"]
+    ]
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    # COPY runs in binary format, so ARRAY columns must stay Python lists; asyncpg
+    # sends them length-prefixed with no text escaping
+    await raw_connection.driver_connection.copy_records_to_table(
+        Apartment.__tablename__,
+        records=list(zip(*values.values(), strict=True)),
+        columns=columns,
+    )
+    return list(zip(values["apartment_id"], values["link"], strict=True))
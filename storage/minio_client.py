@@ -1,19 +1,173 @@
+import asyncio
 import base64
-import io
+import importlib.util
 import logging
+import mimetypes
+import socket
 import uuid
-from typing import BinaryIO
-from urllib.parse import urlparse
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from functools import lru_cache, wraps
+from typing import BinaryIO, Concatenate
 
 import httpx
+import urllib3
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
+from urllib3.connection import HTTPConnection
 
 from broker_agent.config import settings
-from broker_agent.config.settings import config
 
 logger = logging.getLogger(__name__)
 
+try:
+    # SIMD-accelerated drop-in for the stdlib encoder, used when installed
+    import pybase64 as b64
+
+    logger.debug(f"Using pybase64 ({b64.get_simd_name()}) for base64 encoding")
+except ImportError:
+    b64 = base64
+
+try:
+    # Optional fast path for re-encoding PNGs as JPEG before they reach the vision LLM
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+
+# Read size for streamed object downloads; a multiple of 3 so full chunks
+# base64-encode without carry, and large enough to keep per-chunk overhead low
+_STREAM_CHUNK_SIZE = 3 * 256 * 1024
+
+_URL_SCHEMES = ("http://", "https://")
+
+# PNGs smaller than this are passed through as-is; re-encoding them saves little
+_TRANSCODE_MIN_BYTES = 256 * 1024
+
+# Keep-alive pool shared by all image downloads, so handshakes are amortized
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=64, max_connections=128, keepalive_expiry=60.0
+)
+# HTTP/2 needs the optional h2 package; plain keep-alive is used without it
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# The SDK's default pool holds 10 connections per host, fewer than the threads
+# that concurrent uploads and fetches run on
+_MINIO_POOL_SIZE = 128
+# Probe after 30 s idle, every 10 s, and drop the connection after 3 misses
+_TCP_KEEPALIVE_TIMING = (
+    ("TCP_KEEPIDLE", 30),
+    ("TCP_KEEPINTVL", 10),
+    ("TCP_KEEPCNT", 3),
+)
+
+
+def _minio_http_client() -> urllib3.PoolManager:
+    """Connection pool for the Minio SDK, sized for concurrent threaded calls."""
+    # TCP keepalive lets pooled connections that a NAT or load balancer dropped
+    # fail fast instead of hanging the next request
+    socket_options = [
+        *HTTPConnection.default_socket_options,
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    for name, value in _TCP_KEEPALIVE_TIMING:
+        # The timing options are Linux-specific
+        if hasattr(socket, name):
+            socket_options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return urllib3.PoolManager(
+        num_pools=16,
+        socket_options=socket_options,
+        maxsize=_MINIO_POOL_SIZE,
+        block=False,
+        timeout=urllib3.Timeout(connect=5.0, read=60.0),
+        retries=urllib3.Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+        ),
+    )
+
+
+# Multipart part size for streamed uploads whose length isn't known up front
+_UPLOAD_PART_SIZE = 16 << 20
+
+
+@lru_cache(maxsize=64)
+def _extension_for(content_type: str) -> str:
+    """File extension, with its leading dot, for a bare MIME type such as "image/jpeg"."""
+    return mimetypes.guess_extension(content_type) or ".bin"
+
+
+def _minio_op[**P, R](
+    action: str, default: R
+) -> Callable[
+    [Callable[Concatenate["MinioConnector", P], R]],
+    Callable[Concatenate["MinioConnector", P], R],
+]:
+    """
+    Wraps a blocking MinioConnector method so it returns ``default`` instead of
+    raising when the client isn't connected or the call fails, logging why.
+
+    Args:
+        action (str): What the method does, for log messages (e.g. "upload data").
+        default: Value returned when the operation can't be completed.
+    """
+
+    def decorator(
+        method: Callable[Concatenate["MinioConnector", P], R],
+    ) -> Callable[Concatenate["MinioConnector", P], R]:
+        @wraps(method)
+        def wrapper(self: "MinioConnector", *args: P.args, **kwargs: P.kwargs) -> R:
+            if not self.is_connected():
+                logger.warning(f"Not connected to Minio. Cannot {action}.")
+                return default
+            try:
+                return method(self, *args, **kwargs)
+            except S3Error as e:
+                logger.error(f"Minio error trying to {action}: {e}")
+            except Exception as e:
+                logger.error(f"An unexpected error occurred trying to {action}: {e}")
+            return default
+
+        return wrapper
+
+    return decorator
+
+
+class _AsyncByteStreamReader:
+    """
+    Blocking file-like reader over an async byte iterator.
+
+    Lets the Minio SDK, running in a worker thread, pull a streamed HTTP download
+    chunk by chunk from the event loop instead of buffering the whole body first.
+    """
+
+    def __init__(
+        self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop
+    ) -> None:
+        self._chunks = chunks
+        self._loop = loop
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def _next_chunk(self) -> bytes | None:
+        return await anext(self._chunks, None)
+
+    def read(self, size: int = -1) -> bytes:
+        # Short reads are fine; the SDK keeps reading until a part is full
+        while not self._eof and (size < 0 or not self._buffer):
+            chunk = asyncio.run_coroutine_threadsafe(
+                self._next_chunk(), self._loop
+            ).result()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
 
 class MinioConnector:
     """Handles connection and basic operations with a Minio S3-compatible storage."""
@@ -21,18 +175,25 @@ class MinioConnector:
     def __init__(self) -> None:
         """Initializes the Minio client using configuration settings."""
         self.client: Minio | None = None
+        # Created on first use, inside the running event loop
+        self._http: httpx.AsyncClient | None = None
+        # Buckets already confirmed to exist, so uploads skip the existence check
+        self._known_buckets: set[str] = set()
+        # Recently read (base64_data, mime_type) pairs, least recently used first
+        self._b64_cache: OrderedDict[tuple[str, str, bool], tuple[str, str]] = (
+            OrderedDict()
+        )
+        self._b64_cache_bytes = 0
         try:
             self.client = Minio(
                 settings.config.MINIO_ENDPOINT,
                 access_key=settings.config.MINIO_ROOT_USER,
                 secret_key=settings.config.MINIO_ROOT_PASSWORD,
-                secure=False,  # Set to True if using HTTPS
-            )
-            # Verify connection by listing buckets
-            self.client.list_buckets()
-            logger.info(
-                f"Successfully connected to Minio at {settings.config.MINIO_ENDPOINT}"
+                secure=settings.config.MINIO_SECURE,
+                http_client=_minio_http_client(),
             )
+            # No request is made here; connection errors surface on the first call
+            logger.info(f"Configured Minio client for {settings.config.MINIO_ENDPOINT}")
         except S3Error as e:
             logger.error(f"Error connecting to Minio: {e}")
             self.client = None
@@ -40,85 +201,98 @@ class MinioConnector:
             logger.error(f"An unexpected error occurred during Minio connection: {e}")
             self.client = None
 
+    async def aclose(self) -> None:
+        """Closes the shared HTTP client used for image downloads, if one was opened."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        """Returns the shared HTTP client for image downloads, creating it if needed."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=_HTTP_LIMITS,
+                timeout=30.0,
+                http2=_HTTP2,
+                follow_redirects=True,
+            )
+        return self._http
+
     def is_connected(self) -> bool:
-        """Checks if the client is successfully connected to Minio."""
+        """Checks if the Minio client was created; the server is not contacted."""
         return self.client is not None
 
+    @_minio_op("list buckets", default=[])
     def list_buckets(self) -> list[str]:
         """Lists all buckets in the Minio instance.
 
         Returns:
             list[str]: A list of bucket names.
         """
-        if not self.is_connected():
-            logger.warning("Not connected to Minio. Cannot list buckets.")
-            return []
-        try:
-            buckets = self.client.list_buckets()  # type: ignore
-            return [bucket.name for bucket in buckets]
-        except S3Error as e:
-            logger.error(f"Error listing buckets: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"An unexpected error occurred listing buckets: {e}")
-            return []
+        buckets = self.client.list_buckets()  # type: ignore
+        return [bucket.name for bucket in buckets]
 
+    @_minio_op("create bucket", default=False)
     def make_bucket(self, bucket_name: str) -> bool:
         """Creates a new bucket if it doesn't already exist.
 
+        Buckets seen to exist are remembered, so later calls return without a request.
+
         Args:
             bucket_name (str): The name of the bucket to create.
 
         Returns:
             bool: True if the bucket was created or already exists, False otherwise.
         """
-        if not self.is_connected():
-            logger.warning("Not connected to Minio. Cannot create bucket.")
-            return False
-        try:
-            if not self.client.bucket_exists(bucket_name):  # type: ignore
-                self.client.make_bucket(bucket_name)  # type: ignore
-                logger.info(f"Bucket '{bucket_name}' created successfully.")
+        if bucket_name in self._known_buckets:
             return True
-        except S3Error as e:
-            logger.error(f"Error creating bucket '{bucket_name}': {e}")
-            return False
-        except Exception as e:
-            logger.error(
-                f"An unexpected error occurred creating bucket '{bucket_name}': {e}"
-            )
-            return False
-
-    def upload_file(self, bucket_name: str, object_name: str, file_path: str) -> bool:
+        if not self.client.bucket_exists(bucket_name):  # type: ignore
+            self.client.make_bucket(bucket_name)  # type: ignore
+            logger.info(f"Bucket '{bucket_name}' created successfully.")
+        self._known_buckets.add(bucket_name)
+        return True
+
+    @_minio_op("upload file", default=False)
+    def upload_file(
+        self,
+        bucket_name: str,
+        object_name: str,
+        file_path: str,
+        part_size: int | None = None,
+    ) -> bool:
         """Uploads a file to the specified bucket.
 
         Args:
             bucket_name (str): The name of the bucket.
             object_name (str): The object name in the bucket.
             file_path (str): The file path to upload.
+            part_size (int | None, optional): Multipart part size in bytes. Defaults
+                to the value configured via ``minio_part_size``.
 
         Returns:
             bool: True if the file was uploaded successfully, False otherwise.
         """
-        if not self.is_connected():
-            logger.warning("Not connected to Minio. Cannot upload file.")
+        # Create bucket if it doesn't exist
+        if not self.make_bucket(bucket_name):
             return False
-        try:
-            # Create bucket if it doesn't exist
-            if not self.make_bucket(bucket_name):
-                return False
 
-            self.client.fput_object(bucket_name, object_name, file_path)  # type: ignore
-            return True
-        except S3Error as e:
-            logger.error(f"Error uploading file to '{bucket_name}/{object_name}': {e}")
-            return False
-        except Exception as e:
-            logger.error(f"An unexpected error occurred uploading file: {e}")
-            return False
+        self.client.fput_object(  # type: ignore
+            bucket_name,
+            object_name,
+            file_path,
+            part_size=part_size or settings.config.minio_part_size,
+        )
+        return True
 
+    @_minio_op("upload data", default=False)
     def upload_data(
-        self, bucket_name: str, object_name: str, data: BinaryIO, length: int
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        part_size: int | None = None,
+        content_type: str = "application/octet-stream",
     ) -> bool:
         """Uploads data from a file-like object to the specified bucket.
 
@@ -126,28 +300,30 @@ class MinioConnector:
             bucket_name (str): The name of the bucket.
             object_name (str): The object name in the bucket.
             data (BinaryIO): The binary data to upload.
-            length (int): The length of the data in bytes.
+            length (int): The length of the data in bytes, or -1 if unknown.
+            part_size (int | None, optional): Multipart part size in bytes. Defaults
+                to the value configured via ``minio_part_size``.
+            content_type (str, optional): Content-Type stored with the object and
+                returned when it is read. Defaults to "application/octet-stream".
 
         Returns:
             bool: True if the data was uploaded successfully, False otherwise.
         """
-        if not self.is_connected():
-            logger.warning("Not connected to Minio. Cannot upload data.")
-            return False
-        try:
-            # Create bucket if it doesn't exist
-            if not self.make_bucket(bucket_name):
-                return False
-
-            self.client.put_object(bucket_name, object_name, data, length)  # type: ignore
-            return True
-        except S3Error as e:
-            logger.error(f"Error uploading data to '{bucket_name}/{object_name}': {e}")
-            return False
-        except Exception as e:
-            logger.error(f"An unexpected error occurred uploading data: {e}")
+        # Create bucket if it doesn't exist
+        if not self.make_bucket(bucket_name):
             return False
 
+        self.client.put_object(  # type: ignore
+            bucket_name,
+            object_name,
+            data,
+            length,
+            content_type=content_type,
+            part_size=part_size or settings.config.minio_part_size,
+        )
+        return True
+
+    @_minio_op("download file", default=False)
     def download_file(self, bucket_name: str, object_name: str, file_path: str) -> bool:
         """Downloads a file from the specified bucket.
 
@@ -159,44 +335,47 @@ class MinioConnector:
         Returns:
             bool: True if the file was downloaded successfully, False otherwise.
         """
-        if not self.is_connected():
-            logger.warning("Not connected to Minio. Cannot download file.")
-            return False
-        try:
-            self.client.fget_object(bucket_name, object_name, file_path)  # type: ignore
-            return True
-        except S3Error as e:
-            logger.error(
-                f"Error downloading file from '{bucket_name}/{object_name}': {e}"
-            )
-            return False
-        except Exception as e:
-            logger.error(f"An unexpected error occurred downloading file: {e}")
-            return False
+        self.client.fget_object(bucket_name, object_name, file_path)  # type: ignore
+        return True
 
-    def list_objects(self, bucket_name: str, prefix: str = "") -> list[str]:
-        """Lists objects in the specified bucket with an optional prefix.
+    def iter_objects(self, bucket_name: str, prefix: str = "") -> Iterator[str]:
+        """Yields the names of objects in the specified bucket with an optional prefix.
+
+        Listing pages are fetched as the iterator advances, so memory stays bounded
+        and callers can stop early.
 
         Args:
             bucket_name (str): The name of the bucket.
             prefix (str, optional): Prefix of the objects to list. Defaults to "".
 
-        Returns:
-            list[str]: A list of object names.
+        Yields:
+            str: Object names.
         """
         if not self.is_connected():
             logger.warning("Not connected to Minio. Cannot list objects.")
-            return []
+            return
         try:
             objects = self.client.list_objects(bucket_name, prefix=prefix, recursive=True)  # type: ignore
-            return [obj.object_name for obj in objects]
+            for obj in objects:
+                yield obj.object_name
         except S3Error as e:
             logger.error(f"Error listing objects in bucket '{bucket_name}': {e}")
-            return []
         except Exception as e:
             logger.error(f"An unexpected error occurred listing objects: {e}")
-            return []
 
+    def list_objects(self, bucket_name: str, prefix: str = "") -> list[str]:
+        """Lists objects in the specified bucket with an optional prefix.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            prefix (str, optional): Prefix of the objects to list. Defaults to "".
+
+        Returns:
+            list[str]: A list of object names.
+        """
+        return list(self.iter_objects(bucket_name, prefix))
+
+    @_minio_op("remove object", default=False)
     def remove_object(self, bucket_name: str, object_name: str) -> bool:
         """Removes an object from the specified bucket.
 
@@ -207,25 +386,84 @@ class MinioConnector:
         Returns:
             bool: True if the object was removed successfully, False otherwise.
         """
+        self.client.remove_object(bucket_name, object_name)  # type: ignore
+        logger.info(f"Object '{bucket_name}/{object_name}' removed successfully.")
+        return True
+
+    def remove_objects(
+        self, bucket_name: str, object_names: Iterable[str]
+    ) -> list[str]:
+        """Removes many objects from the specified bucket with bulk delete requests.
+
+        The SDK deletes up to 1000 objects per request instead of one per round trip.
+
+        Args:
+            bucket_name (str): The name of the bucket.
+            object_names (Iterable[str]): The object names to remove.
+
+        Returns:
+            list[str]: The names of objects that could not be removed.
+        """
+        names = list(object_names)
         if not self.is_connected():
-            logger.warning("Not connected to Minio. Cannot remove object.")
-            return False
+            logger.warning("Not connected to Minio. Cannot remove objects.")
+            return names
         try:
-            self.client.remove_object(bucket_name, object_name)  # type: ignore
-            logger.info(f"Object '{bucket_name}/{object_name}' removed successfully.")
-            return True
+            # Deletes are only sent as the returned error iterator is consumed
+            errors = self.client.remove_objects(  # type: ignore
+                bucket_name, (DeleteObject(name) for name in names)
+            )
+            failed = []
+            for error in errors:
+                logger.error(
+                    f"Error removing object '{bucket_name}/{error.name}': {error.message}"
+                )
+                failed.append(error.name)
+            logger.info(
+                f"Removed {len(names) - len(failed)} objects from '{bucket_name}'."
+            )
+            return failed
         except S3Error as e:
-            logger.error(f"Error removing object '{bucket_name}/{object_name}': {e}")
-            return False
+            logger.error(f"Error removing objects from '{bucket_name}': {e}")
+            return names
         except Exception as e:
-            logger.error(f"An unexpected error occurred removing object: {e}")
-            return False
+            logger.error(f"An unexpected error occurred removing objects: {e}")
+            return names
+
+    async def aupload_data(
+        self,
+        bucket_name: str,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        part_size: int | None = None,
+        content_type: str = "application/octet-stream",
+    ) -> bool:
+        """Async wrapper for ``upload_data`` that runs the blocking upload in a thread."""
+        return await asyncio.to_thread(
+            self.upload_data,
+            bucket_name,
+            object_name,
+            data,
+            length,
+            part_size,
+            content_type,
+        )
+
+    async def aremove_object(self, bucket_name: str, object_name: str) -> bool:
+        """Async wrapper for ``remove_object`` that runs the blocking call in a thread."""
+        return await asyncio.to_thread(self.remove_object, bucket_name, object_name)
 
     async def download_image(self, img_url: str) -> str | None:
         """Downloads an image from a URL, uploads it to Minio, and returns the Minio URL.
 
         This method fetches an image from the provided URL, determines its content type,
         generates a unique filename, and uploads it to the configured Minio bucket.
+        Downloads share one pooled HTTP client, so connections to the same image host
+        are kept alive between calls; call ``aclose`` on shutdown. The body is streamed
+        into the upload rather than read into memory first, and responses that aren't
+        images or are larger than ``minio_max_image_bytes`` are dropped from their
+        headers alone.
 
         Args:
             img_url (str): The URL of the image to download.
@@ -238,40 +476,60 @@ class MinioConnector:
             return None
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    img_url, follow_redirects=True, timeout=30.0
-                )
+            async with self._http_client().stream("GET", img_url) as response:
                 response.raise_for_status()  # Raise exception for 4xx/5xx status codes
 
-            image_content = response.content
-            content_type = response.headers.get(
-                "content-type", "image/webp"
-            )  # Default to webp
-            extension = content_type.split("/")[-1] if "/" in content_type else "webp"
-            object_name = f"{uuid.uuid4()}.{extension}"
-
-            # Ensure bucket exists (make_bucket handles existing)
-            if not self.make_bucket(config.minio_bucket):
-                logger.error(
-                    f"Failed to ensure Minio bucket '{config.minio_bucket}' exists."
+                # Default to webp; parameters such as charset are dropped
+                content_type = (
+                    response.headers.get("content-type", "image/webp")
+                    .split(";", 1)[0]
+                    .strip()
+                )
+                # Bail out on error pages and oversized files before reading the body
+                declared_length = int(response.headers.get("content-length", 0))
+                if (
+                    not content_type.startswith("image/")
+                    or declared_length > settings.config.minio_max_image_bytes
+                ):
+                    logger.warning(
+                        f"Skipping {img_url}: {content_type} of {declared_length} bytes "
+                        f"is not an image within the size limit."
+                    )
+                    return None
+                object_name = f"{uuid.uuid4().hex}{_extension_for(content_type)}"
+
+                # Content-Length counts encoded bytes, but the body is read decoded
+                length = -1
+                if response.headers.get("content-encoding", "identity") == "identity":
+                    length = int(response.headers.get("content-length", -1))
+                # Unknown lengths buffer a whole part, so keep those parts smaller
+                part_size = (
+                    settings.config.minio_part_size
+                    if length >= 0
+                    else _UPLOAD_PART_SIZE
                 )
-                return None
 
-            success = self.upload_data(
-                bucket_name=config.minio_bucket,
-                object_name=object_name,
-                data=io.BytesIO(image_content),
-                length=len(image_content),
-            )
+                # Stream the body straight into the upload so only one part is held
+                # in memory at a time; upload_data also makes sure the bucket exists
+                reader = _AsyncByteStreamReader(
+                    response.aiter_bytes(), asyncio.get_running_loop()
+                )
+                success = await self.aupload_data(
+                    bucket_name=settings.config.minio_bucket,
+                    object_name=object_name,
+                    data=reader,
+                    length=length,
+                    part_size=part_size,
+                    content_type=content_type,
+                )
 
             if success:
-                minio_url = f"{config.minio_bucket}/{object_name}"
+                minio_url = f"{settings.config.minio_bucket}/{object_name}"
                 logger.debug(f"Successfully uploaded {img_url} to {minio_url}")
                 return minio_url
             else:
                 logger.error(
-                    f"Failed to upload image {img_url} to Minio bucket {config.minio_bucket}."
+                    f"Failed to upload image {img_url} to Minio bucket {settings.config.minio_bucket}."
                 )
                 return None
 
@@ -282,8 +540,33 @@ class MinioConnector:
             logger.error(f"Error processing image {img_url}: {e}")
             return None
 
+    async def download_images(
+        self, img_urls: list[str], concurrency: int = 16
+    ) -> list[str | None]:
+        """Downloads several images concurrently and uploads each to Minio.
+
+        Args:
+            img_urls (list[str]): The URLs of the images to download.
+            concurrency (int, optional): Maximum number of images in flight at once.
+                Defaults to 16.
+
+        Returns:
+            list[Optional[str]]: The Minio URL of each image, in input order, or None
+            for images that could not be downloaded or uploaded.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def download_one(img_url: str) -> str | None:
+            async with semaphore:
+                return await self.download_image(img_url)
+
+        results = await asyncio.gather(
+            *(download_one(img_url) for img_url in img_urls), return_exceptions=True
+        )
+        return [None if isinstance(r, BaseException) else r for r in results]
+
     async def get_object_as_base64(
-        self, url: str
+        self, url: str, png_to_jpeg: bool = False
     ) -> tuple[str | None, str | None]:
         """
         Retrieve an object from Minio and return it as base64 encoded data along with its mime type.
@@ -292,11 +575,16 @@ class MinioConnector:
         It robustly extracts the bucket and object name from the input, retrieves the object data,
         determines the content type (MIME type), and encodes the data as a base64 string.
 
-        Minio stores user metadata keys in lowercase, but Content-Type may also appear as a header,
-        so both "content-type" and "Content-Type" are checked when determining the MIME type.
+        The MIME type is the Content-Type the object was uploaded with, read from the
+        headers of the same GET request that returns the data. Results are kept in an
+        LRU cache bounded by ``minio_base64_cache_bytes``, so an image sent to several
+        prompts is only downloaded and encoded once.
 
         Args:
             url (str): The Minio URL in format "bucket_name/object_name" or a full URL.
+            png_to_jpeg (bool, optional): Re-encode large PNGs as JPEG with OpenCV, for
+                consumers that accept JPEG. Ignored if OpenCV is not installed.
+                Defaults to False.
 
         Returns:
             Tuple[Optional[str], Optional[str]]: A tuple containing (base64_encoded_data, mime_type),
@@ -307,34 +595,58 @@ class MinioConnector:
             return None, None
 
         try:
-            if url.startswith("http://") or url.startswith("https://"):
-                parsed = urlparse(url)
-                path = parsed.path.lstrip("/")
-                parts = path.split("/", 1)
-            else:
-                parts = url.split("/", 1)
-
-            if len(parts) != 2 or not parts[0] or not parts[1]:
-                logger.error(
-                    f"Invalid Minio URL format: {url}. Expected 'bucket/object' or full URL."
-                )
+            parts = self._split_object_url(url)
+            if parts is None:
                 return None, None
 
             bucket_name, object_name = parts
 
-            response = self.client.get_object(bucket_name, object_name)  # type: ignore
-            data = response.read()
-
-            stat = self.client.stat_object(bucket_name, object_name)  # type: ignore
-            mime_type = (
-                stat.metadata.get("content-type")
-                or stat.metadata.get("Content-Type")
-                or "application/octet-stream"
+            # Object names are never reused, so a cached encoding is never stale
+            cache_key = (bucket_name, object_name, png_to_jpeg)
+            cached = self._b64_cache.get(cache_key)
+            if cached is not None:
+                self._b64_cache.move_to_end(cache_key)
+                return cached
+
+            # The Minio client is blocking, so run it off the event loop to let
+            # concurrent fetches overlap
+            result = await asyncio.to_thread(
+                self._read_object_as_base64, bucket_name, object_name, png_to_jpeg
             )
+            self._cache_base64(cache_key, result)
+            return result
 
-            base64_data = base64.b64encode(data).decode("utf-8")
+        except S3Error as e:
+            logger.error(f"Error retrieving object '{url}' from Minio: {e}")
+            return None, None
+        except Exception as e:
+            logger.error(f"An unexpected error occurred retrieving object: {e}")
+            return None, None
+
+    async def get_object_raw(self, url: str) -> tuple[bytes | None, str | None]:
+        """
+        Retrieve an object from Minio as raw bytes along with its mime type.
+
+        Accepts the same "bucket/object" paths and full URLs as ``get_object_as_base64``,
+        for consumers that can send image bytes as-is and skip base64 entirely.
+
+        Args:
+            url (str): The Minio URL in format "bucket_name/object_name" or a full URL.
+
+        Returns:
+            Tuple[Optional[bytes], Optional[str]]: A tuple containing (data, mime_type),
+            or (None, None) if unsuccessful.
+        """
+        if not self.is_connected():
+            logger.warning("Not connected to Minio. Cannot get object.")
+            return None, None
+
+        try:
+            parts = self._split_object_url(url)
+            if parts is None:
+                return None, None
 
-            return base64_data, mime_type
+            return await asyncio.to_thread(self._read_object_raw, *parts)
 
         except S3Error as e:
             logger.error(f"Error retrieving object '{url}' from Minio: {e}")
@@ -343,5 +655,155 @@ class MinioConnector:
             logger.error(f"An unexpected error occurred retrieving object: {e}")
             return None, None
 
+    async def get_object_bytes(
+        self, url: str, png_to_jpeg: bool = False
+    ) -> bytes | None:
+        """
+        Retrieve an object from Minio as raw bytes.
 
-connector = MinioConnector()
+        Like ``get_object_raw`` without the mime type, for consumers such as the
+        Ollama client that take image bytes directly.
+
+        Args:
+            url (str): The Minio URL in format "bucket_name/object_name" or a full URL.
+            png_to_jpeg (bool, optional): Re-encode large PNGs as JPEG with OpenCV, as
+                ``get_object_as_base64`` does. Defaults to False.
+
+        Returns:
+            Optional[bytes]: The object data, or None if unsuccessful.
+        """
+        data, mime_type = await self.get_object_raw(url)
+        if (
+            data is not None
+            and png_to_jpeg
+            and mime_type == "image/png"
+            and len(data) >= _TRANSCODE_MIN_BYTES
+            and _can_transcode()
+        ):
+            # Decoding and encoding are CPU-bound, so keep them off the event loop
+            jpeg = await asyncio.to_thread(self._png_to_jpeg, data)
+            if jpeg is not None:
+                return jpeg
+        return data
+
+    def _cache_base64(self, key: tuple[str, str, bool], value: tuple[str, str]) -> None:
+        """Cache an encoded object, evicting the least recently used ones to stay in budget."""
+        budget = settings.config.minio_base64_cache_bytes
+        size = len(value[0])
+        if size > budget:
+            return
+        previous = self._b64_cache.pop(key, None)
+        if previous is not None:
+            self._b64_cache_bytes -= len(previous[0])
+        self._b64_cache[key] = value
+        self._b64_cache_bytes += size
+        while self._b64_cache_bytes > budget:
+            _, (evicted, _) = self._b64_cache.popitem(last=False)
+            self._b64_cache_bytes -= len(evicted)
+
+    @staticmethod
+    def _split_object_url(url: str) -> tuple[str, str] | None:
+        """Split a Minio URL or "bucket/object" path into (bucket_name, object_name)."""
+        if url.startswith(_URL_SCHEMES):
+            # Drop the scheme and host; only the path names the bucket and object
+            path = url.split("://", 1)[1].partition("/")[2]
+            parts = path.split("?", 1)[0].split("#", 1)[0].lstrip("/").split("/", 1)
+        else:
+            parts = url.split("/", 1)
+
+        if len(parts) != 2 or not parts[0] or not parts[1]:
+            logger.error(
+                f"Invalid Minio URL format: {url}. Expected 'bucket/object' or full URL."
+            )
+            return None
+
+        return parts[0], parts[1]
+
+    def _read_object_raw(self, bucket_name: str, object_name: str) -> tuple[bytes, str]:
+        """Blocking helper that reads an object's full contents and mime type."""
+        response = self.client.get_object(bucket_name, object_name)  # type: ignore
+        try:
+            mime_type = response.headers.get("content-type", "application/octet-stream")
+            return response.read(), mime_type
+        finally:
+            response.close()
+            response.release_conn()
+
+    def _read_object_as_base64(
+        self, bucket_name: str, object_name: str, png_to_jpeg: bool = False
+    ) -> tuple[str, str]:
+        """Blocking helper that reads an object and returns (base64_data, mime_type)."""
+        response = self.client.get_object(bucket_name, object_name)  # type: ignore
+        try:
+            # The Content-Type given at upload comes back on the GET itself, so no
+            # separate stat request is needed
+            mime_type = response.headers.get("content-type", "application/octet-stream")
+            size = int(response.headers.get("content-length", 0))
+
+            if (
+                png_to_jpeg
+                and mime_type == "image/png"
+                and size >= _TRANSCODE_MIN_BYTES
+                and _can_transcode()
+            ):
+                data = response.read()
+                jpeg = self._png_to_jpeg(data)
+                if jpeg is not None:
+                    return b64.b64encode(jpeg).decode("ascii"), "image/jpeg"
+                return b64.b64encode(data).decode("ascii"), mime_type
+
+            # Encode while streaming so the raw object is never held in memory in
+            # full. Chunks may be any length, so bytes past a multiple of 3 carry
+            # over to the next chunk to keep the output free of mid-stream padding.
+            encoded = bytearray()
+            carry = b""
+            for chunk in response.stream(_STREAM_CHUNK_SIZE):
+                if carry:
+                    chunk = carry + chunk
+                aligned = len(chunk) - len(chunk) % 3
+                # memoryview slices encode in place instead of copying the chunk
+                encoded += b64.b64encode(memoryview(chunk)[:aligned])
+                carry = chunk[aligned:]
+        finally:
+            response.close()
+            response.release_conn()
+        encoded += b64.b64encode(carry)
+
+        return encoded.decode("ascii"), mime_type
+
+    @staticmethod
+    def _png_to_jpeg(data: bytes) -> bytes | None:
+        """Re-encode PNG data as JPEG with OpenCV, or return None if it can't be decoded."""
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            return None
+        ok, encoded = cv2.imencode(
+            ".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, settings.config.minio_jpeg_quality]
+        )
+        return encoded.tobytes() if ok else None
+
+
+def _can_transcode() -> bool:
+    """Whether OpenCV is available to re-encode PNGs, warning once if it is not."""
+    if cv2 is None:
+        _warn_cv2_missing()
+        return False
+    return True
+
+
+@lru_cache(maxsize=1)
+def _warn_cv2_missing() -> None:
+    """Logs, once per process, that PNGs are passed through without OpenCV."""
+    logger.warning(
+        "minio_png_to_jpeg is set but OpenCV is not installed; PNGs are sent "
+        "as-is. Install the 'vision' extra to re-encode them."
+    )
+
+
+@lru_cache(maxsize=1)
+def get_connector() -> MinioConnector:
+    """
+    Returns the shared MinioConnector, creating it on first use so importing this
+    module doesn't contact Minio.
+    """
+    return MinioConnector()